@@ -6,12 +6,10 @@
 # Python Imports
 from threading import Timer
 import time
-import requests
 
 # Custom Imports
 from ..config import API_CFG
-from ..helpers.utils import get_players
-from ..players.player import Player
+from .client import ApiClient
 
 
 # =============================================================================
@@ -40,9 +38,6 @@ def on_load():
     if API_CFG["authenticate"]:
         authenticate()
 
-    for player in get_players():
-        Player.add_player(player.playerinfo, player.index)
-
 
 def on_unload():
     """Call this on plugin unload to revoke JWT tokens
@@ -68,12 +63,17 @@ def authenticate():
     # make sure we're using https
     assert API_CFG["host"].startswith("https://")
 
-    r = requests.post(
-        API_CFG["host"] + "/token/auth",
+    r = ApiClient.instance().post(
+        "token",
+        "/token/auth",
         headers={"Content-Type": "application/json"},
         json={"username": API_CFG["username"], "password": API_CFG["password"]},
     )
 
+    if r is None:
+        print("[jtimer] Failed to authenticate with the api, api unavailable.")
+        return
+
     if r.status_code != 200:
         print("[jtimer] Failed to authenticate with the api.")
         print(r.content)
@@ -134,11 +134,16 @@ def refresh_access():
     # make sure we're using https
     assert API_CFG["host"].startswith("https://")
 
-    r = requests.post(
-        API_CFG["host"] + "/token/refresh",
+    r = ApiClient.instance().post(
+        "token",
+        "/token/refresh",
         headers={"Authorization": f"Bearer {_refresh_token}"},
     )
 
+    if r is None:
+        print("[jtimer] Failed to refresh access_token, api unavailable.")
+        return
+
     if r.status_code != 200:
         print("[jtimer] Failed to refresh access_token.")
         print(r.content)
@@ -209,11 +214,16 @@ def revoke_token(token, token_type):
     # make sure we're using https
     assert API_CFG["host"].startswith("https://")
 
-    r = requests.post(
-        API_CFG["host"] + f"/token/revoke/{token_type}",
+    r = ApiClient.instance().post(
+        "token",
+        f"/token/revoke/{token_type}",
         headers={"Authorization": f"Bearer {token}"},
     )
 
+    if r is None:
+        print(f"[jtimer] Failed to revoke {token_type} token, api unavailable.")
+        return
+
     if r.status_code != 200:
         print(f"[jtimer] Failed to revoke {token_type} token.")
         print(r.content)
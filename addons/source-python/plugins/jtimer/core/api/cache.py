@@ -0,0 +1,190 @@
+"""Module for caching api responses on disk."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from hashlib import sha1
+from threading import Lock
+import json
+import os
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Custom Imports
+from ..constants.paths import DATA_PATH
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+CACHE_PATH = DATA_PATH / "http_cache"
+
+# seconds a response is served without asking the api, per endpoint
+TTLS = {"maps": 300, "zones": 3600, "times": 30, "players": 60}
+DEFAULT_TTL = 60
+
+# seconds after the ttl a response is still served while it's refreshed,
+# records and leaderboards change with every finish so they aren't served stale
+STALE_WINDOWS = {"maps": 0, "times": 0}
+DEFAULT_STALE_WINDOW = 24 * 60 * 60
+
+# total size of cached bodies before least recently used ones are evicted
+MAX_CACHE_BYTES = 8 * 1024 * 1024
+
+# response headers kept with cached bodies
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+# =============================================================================
+# >> RESPONSE CACHE CLASS
+# =============================================================================
+class ResponseCache:
+    """Size bounded LRU cache of api responses, one file per response."""
+
+    def __init__(self):
+        """Create a new ResponseCache, indexing responses already on disk."""
+        os.makedirs(CACHE_PATH, exist_ok=True)
+
+        # {key: [size, last used]}, used for eviction without reading files
+        self._index = {}
+        self.size = 0
+        self.stats = {"fresh": 0, "stale": 0, "revalidated": 0, "misses": 0}
+        self._lock = Lock()
+
+        for name in os.listdir(CACHE_PATH):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(CACHE_PATH / name)
+            self._index[name[:-5]] = [stat.st_size, stat.st_mtime]
+            self.size += stat.st_size
+
+    def get(self, key):
+        """Return cached _Entry or None."""
+        try:
+            with open(CACHE_PATH / f"{key}.json", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = time.time()
+        return _Entry(key, data)
+
+    def store(self, key, endpoint, r):
+        """Cache a 200 response."""
+        data = {
+            "endpoint": endpoint,
+            "url": r.url,
+            "stored": time.time(),
+            "headers": {h: r.headers[h] for h in KEPT_HEADERS if h in r.headers},
+            "body": r.text,
+        }
+        self._write(key, data)
+
+    def invalidate(self, path):
+        """Drop cached responses of a path, with any params."""
+        prefix = _digest(path) + "-"
+        with self._lock:
+            for key in [k for k in self._index if k.startswith(prefix)]:
+                self.size -= self._index.pop(key)[0]
+                try:
+                    os.remove(CACHE_PATH / f"{key}.json")
+                except OSError:
+                    pass
+
+    def touch(self, entry):
+        """Mark an entry fresh again after the api answered 304."""
+        entry.data["stored"] = time.time()
+        self._write(entry.key, entry.data)
+
+    def _write(self, key, data):
+        """Write an entry and evict old ones if over MAX_CACHE_BYTES."""
+        path = CACHE_PATH / f"{key}.json"
+        temp_path = str(path) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            old = self._index.get(key)
+            if old is not None:
+                self.size -= old[0]
+            self._index[key] = [size, time.time()]
+            self.size += size
+
+            while self.size > MAX_CACHE_BYTES and len(self._index) > 1:
+                oldest = min(self._index, key=lambda k: self._index[k][1])
+                self.size -= self._index.pop(oldest)[0]
+                try:
+                    os.remove(CACHE_PATH / f"{oldest}.json")
+                except OSError:
+                    pass
+
+
+class _Entry:
+    """Cached response."""
+
+    __slots__ = ("key", "data")
+
+    def __init__(self, key, data):
+        """Create a new entry from its file contents."""
+        self.key = key
+        self.data = data
+
+    @property
+    def age(self):
+        """Seconds since the response was stored or revalidated."""
+        return time.time() - self.data["stored"]
+
+    @property
+    def ttl(self):
+        """Seconds the response is fresh for."""
+        return TTLS.get(self.data["endpoint"], DEFAULT_TTL)
+
+    def is_fresh(self):
+        """Returns True if the response can be used without asking the api."""
+        return self.age <= self.ttl
+
+    def is_usable(self):
+        """Returns True if the response can be used while it's refreshed."""
+        stale_window = STALE_WINDOWS.get(self.data["endpoint"], DEFAULT_STALE_WINDOW)
+        return self.age <= self.ttl + stale_window
+
+    def conditional_headers(self):
+        """Headers for asking the api if the response changed."""
+        headers = {}
+        if "ETag" in self.data["headers"]:
+            headers["If-None-Match"] = self.data["headers"]["ETag"]
+        if "Last-Modified" in self.data["headers"]:
+            headers["If-Modified-Since"] = self.data["headers"]["Last-Modified"]
+        return headers
+
+    def response(self):
+        """Build a requests.Response from the cached response."""
+        r = requests.Response()
+        r.status_code = 200
+        r.url = self.data["url"]
+        r.headers = CaseInsensitiveDict(self.data["headers"])
+        r.encoding = "utf-8"
+        r._content = self.data["body"].encode("utf-8")
+        return r
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def cache_key(path, params):
+    """Return the cache key of a request,
+    responses of the same path share a prefix so they can be invalidated."""
+    query = ""
+    if params:
+        query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{_digest(path)}-{_digest(query)}"
+
+
+def _digest(text):
+    """Short hash of text for file names."""
+    return sha1(text.encode("utf-8")).hexdigest()[:20]
@@ -0,0 +1,267 @@
+"""Module for sending requests to the api."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from bisect import bisect_left
+from threading import Lock
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# Custom Imports
+from ..config import API_CFG
+from ..helpers.executor import Executor, Priority
+from .cache import ResponseCache, cache_key
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# (connect, read) timeouts in seconds per endpoint
+DEADLINES = {
+    "token": (3.05, 10),
+    "maps": (3.05, 5),
+    "zones": (3.05, 5),
+    "times": (3.05, 5),
+    "times.insert": (3.05, 15),
+    "players": (3.05, 5),
+}
+DEFAULT_DEADLINE = (3.05, 10)
+
+# keep-alive connections to the api host
+POOL_SIZE = 8
+
+# failed requests in a row before failing fast
+BREAKER_THRESHOLD = 5
+
+# seconds to fail fast before letting a request through again
+BREAKER_COOLDOWN = 30
+
+# upper bounds of latency histogram buckets in ms
+LATENCY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+# =============================================================================
+# >> API CLIENT CLASS
+# =============================================================================
+class ApiClient:
+    """Singleton ApiClient class.
+    All api requests share one keep-alive session and one circuit breaker."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if ApiClient.__instance is None:
+            ApiClient()
+        return ApiClient.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if ApiClient.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+        # {endpoint: LatencyHistogram}
+        self.latencies = {}
+        self._latencies_lock = Lock()
+
+        self.cache = ResponseCache()
+        # cache keys being refreshed in the background
+        self._revalidating = set()
+        self._revalidating_lock = Lock()
+        ApiClient.__instance = self
+
+    def get(self, endpoint, path, **kwargs):
+        """Send a GET request, see request."""
+        return self.request("GET", endpoint, path, **kwargs)
+
+    def cached_get(self, endpoint, path, params=None):
+        """Send a GET request through the response cache.
+        Fresh responses are served from disk, stale ones are served
+        while they're refreshed in the background.
+        Returns the response, or None if there's neither a response
+        nor a cached one."""
+        key = cache_key(path, params)
+        entry = self.cache.get(key)
+
+        if entry is not None and entry.is_fresh():
+            self.cache.stats["fresh"] += 1
+            return entry.response()
+
+        if entry is not None and entry.is_usable():
+            self.cache.stats["stale"] += 1
+            self._revalidate_later(endpoint, path, params, key, entry)
+            return entry.response()
+
+        self.cache.stats["misses"] += 1
+        return self._fetch(endpoint, path, params, key, entry)
+
+    def _fetch(self, endpoint, path, params, key, entry):
+        """GET and cache a response, asking only for changes if cached."""
+        headers = entry.conditional_headers() if entry is not None else {}
+        r = self.get(endpoint, path, params=params, headers=headers)
+
+        if r is None or (r.status_code >= 500 and entry is not None):
+            # api is down, old data is better than none
+            return entry.response() if entry is not None else r
+
+        if r.status_code == 304 and entry is not None:
+            self.cache.stats["revalidated"] += 1
+            self.cache.touch(entry)
+            return entry.response()
+
+        if r.status_code == 200:
+            self.cache.store(key, endpoint, r)
+        return r
+
+    def _revalidate_later(self, endpoint, path, params, key, entry):
+        """Refresh a cached response on a worker thread."""
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        if not Executor.instance().submit(
+            Priority.BACKGROUND, self._revalidate, endpoint, path, params, key, entry
+        ):
+            with self._revalidating_lock:
+                self._revalidating.discard(key)
+
+    def _revalidate(self, endpoint, path, params, key, entry):
+        """Refresh a cached response."""
+        try:
+            self._fetch(endpoint, path, params, key, entry)
+        finally:
+            with self._revalidating_lock:
+                self._revalidating.discard(key)
+
+    def post(self, endpoint, path, **kwargs):
+        """Send a POST request, see request."""
+        return self.request("POST", endpoint, path, **kwargs)
+
+    def request(self, method, endpoint, path, **kwargs):
+        """Send a request to the api host.
+        endpoint names the deadline and histogram to use, e.g. "maps".
+        Returns the response, or None if the request failed or the api is down."""
+        if not self.breaker.allow():
+            return None
+
+        kwargs.setdefault("timeout", deadline(endpoint))
+
+        start = time.perf_counter()
+        try:
+            r = self.session.request(method, API_CFG["host"] + path, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.record(False)
+            self.histogram(endpoint).record(time.perf_counter() - start, failed=True)
+            print(f"[jtimer] Api request to '{path}' failed: {e.__class__.__name__}")
+            return None
+
+        self.breaker.record(r.status_code < 500)
+        self.histogram(endpoint).record(
+            time.perf_counter() - start, failed=r.status_code >= 500
+        )
+        return r
+
+    def histogram(self, endpoint):
+        """Return the LatencyHistogram of an endpoint."""
+        histogram = self.latencies.get(endpoint)
+        if histogram is None:
+            with self._latencies_lock:
+                histogram = self.latencies.setdefault(endpoint, LatencyHistogram())
+        return histogram
+
+
+class CircuitBreaker:
+    """Fails fast after too many failed requests in a row."""
+
+    def __init__(self, threshold, cooldown):
+        """Create a new closed CircuitBreaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._lock = Lock()
+
+    @property
+    def state(self):
+        """closed, open or half-open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def allow(self):
+        """Returns True if a request may be sent."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # let one request through to probe the api
+                self.opened_at = time.monotonic()
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record(self, success):
+        """Record the outcome of a request."""
+        with self._lock:
+            if success:
+                if self.opened_at is not None:
+                    print("[jtimer] Api is reachable again.")
+                self.failures = 0
+                self.opened_at = None
+                return
+
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(
+                        f"[jtimer] Api failed {self.failures} times in a row, "
+                        f"pausing requests for {self.cooldown}s."
+                    )
+                self.opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    """Request latencies counted in LATENCY_BUCKETS."""
+
+    def __init__(self):
+        """Create a new empty LatencyHistogram."""
+        # last bucket counts everything slower than LATENCY_BUCKETS
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.requests = 0
+        self.failures = 0
+        self.seconds = 0.0
+
+    def record(self, seconds, failed=False):
+        """Add a request."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds * 1000)] += 1
+        self.requests += 1
+        self.seconds += seconds
+        if failed:
+            self.failures += 1
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def deadline(endpoint):
+    """Return (connect, read) timeout for an endpoint.
+    "times.insert" falls back to "times" and then to DEFAULT_DEADLINE."""
+    while endpoint:
+        if endpoint in DEADLINES:
+            return DEADLINES[endpoint]
+        endpoint = endpoint.rpartition(".")[0]
+    return DEFAULT_DEADLINE
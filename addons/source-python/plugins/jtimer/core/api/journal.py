@@ -0,0 +1,405 @@
+"""Module for journaling map times until they're uploaded."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from threading import Lock, Timer
+import json
+import os
+import random
+import time
+import uuid
+
+# Custom Imports
+from ..config import API_CFG
+from ..constants.paths import DATA_PATH
+from ..helpers.completions import CompletionQueue
+from ..helpers.executor import Executor, Priority
+from .times import add_map_time, add_map_times, check_map_time
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+JOURNAL_FILE = DATA_PATH / "uploads.journal"
+
+# runs waiting for upload, new runs are refused when full
+MAX_PENDING = 500
+
+# runs rejected by the api, kept for inspection, oldest dropped first
+MAX_FAILED = 50
+
+# journal size that triggers rewriting it with only live entries
+MAX_JOURNAL_BYTES = 256 * 1024
+
+# uploads per drain
+BATCH_SIZE = 10
+
+# seconds to wait for more finishes to upload together in batch mode
+BATCH_WINDOW = 1.0
+
+# seconds before the first retry, doubled every attempt up to RETRY_MAX
+RETRY_BASE = 5
+RETRY_MAX = 600
+
+# 4xx responses that are worth retrying
+RETRY_STATUS = (401, 408, 429)
+
+
+# =============================================================================
+# >> UPLOAD JOURNAL CLASS
+# =============================================================================
+class UploadJournal:
+    """Singleton UploadJournal class.
+    Finished runs are appended to a journal on disk before they're uploaded,
+    so they survive api outages, plugin reloads and server restarts."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if UploadJournal.__instance is None:
+            UploadJournal()
+        return UploadJournal.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if UploadJournal.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        # {idempotency key: entry}, oldest first
+        self.pending = {}
+        self.failed = {}
+        # {idempotency key: callback(result)} for runs finished since load
+        self._callbacks = {}
+        self._lock = Lock()
+        self._drain_lock = Lock()
+        # held while touching the journal file, never taken with _lock held
+        self._file_lock = Lock()
+        self._timer = None
+        # time.monotonic() the scheduled drain runs at
+        self._timer_deadline = 0.0
+        self._file = None
+        # records applied in memory but not written to the journal yet
+        self._unwritten = []
+        self._closed = False
+        # send due runs in one request, turned off if the api doesn't support it
+        self.batch = API_CFG["batch_uploads"]
+        # runs uploaded and requests sent for them
+        self.stats = {"runs": 0, "requests": 0}
+
+        self._load()
+        UploadJournal.__instance = self
+
+    def add(
+        self,
+        map_id,
+        player_id,
+        player_class,
+        start_time,
+        end_time,
+        checkpoints,
+        callback=None,
+    ):
+        """Journal a map time and queue it for upload,
+        callback(result) is called on the main thread once uploaded.
+        Returns False if the run is invalid or the journal is full."""
+        try:
+            check_map_time(
+                map_id, player_id, player_class, start_time, end_time, checkpoints
+            )
+        except AssertionError:
+            print(f"[jtimer] Not uploading invalid map time of player {player_id}.")
+            return False
+
+        with self._lock:
+            if len(self.pending) >= MAX_PENDING:
+                print("[jtimer] Upload journal is full, dropped map time.")
+                return False
+
+            key = uuid.uuid4().hex
+            entry = {
+                "map_id": map_id,
+                "player_id": player_id,
+                "player_class": player_class,
+                "start_time": start_time,
+                "end_time": end_time,
+                "checkpoints": checkpoints,
+                "created": time.time(),
+                "attempts": 0,
+                "next_attempt": 0,
+            }
+            self._write({"op": "add", "key": key, "entry": entry})
+            self.pending[key] = entry
+            if callback is not None:
+                self._callbacks[key] = callback
+
+        # disk writes stay off the game thread,
+        # if the queue is full the next drain writes the record
+        Executor.instance().submit(Priority.UPLOAD, self._flush)
+        self._schedule(BATCH_WINDOW if self.batch else 0)
+        return True
+
+    def start(self):
+        """Start uploading journaled runs."""
+        self._schedule(0)
+
+    def close(self):
+        """Stop uploading, pending runs stay in the journal."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        self._flush()
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        UploadJournal.__instance = None
+
+    def _load(self):
+        """Replay the journal and rewrite it with live entries only."""
+        os.makedirs(DATA_PATH, exist_ok=True)
+
+        if os.path.exists(JOURNAL_FILE):
+            with open(JOURNAL_FILE, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        # partially written line from a crash
+                        continue
+
+        with self._file_lock:
+            self._compact()
+
+        if self.pending or self.failed:
+            print(
+                f"[jtimer] Upload journal has {len(self.pending)} pending "
+                f"and {len(self.failed)} failed map times."
+            )
+
+    def _apply(self, record):
+        """Apply a journal record to pending and failed entries."""
+        key = record["key"]
+        op = record["op"]
+
+        if op == "add":
+            self.pending[key] = record["entry"]
+
+        elif op == "retry":
+            entry = self.pending.get(key)
+            if entry is not None:
+                entry["attempts"] = record["attempts"]
+                entry["next_attempt"] = record["next_attempt"]
+
+        elif op == "done":
+            self.pending.pop(key, None)
+
+        elif op == "failed":
+            entry = self.pending.pop(key, None)
+            if entry is not None:
+                entry["error"] = record["error"]
+                self.failed[key] = entry
+                while len(self.failed) > MAX_FAILED:
+                    del self.failed[next(iter(self.failed))]
+
+    def _write(self, record):
+        """Queue a record for the journal, call with _lock held.
+        Records are written in order by _flush."""
+        self._unwritten.append(record)
+
+    def _flush(self):
+        """Append queued records to the journal and sync it to disk,
+        blocking, call from a worker thread."""
+        with self._file_lock:
+            with self._lock:
+                records = self._unwritten
+                self._unwritten = []
+
+            if self._file is None or not records:
+                return
+
+            self._file.write("".join(json.dumps(r) + "\n" for r in records))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            if self._file.tell() > MAX_JOURNAL_BYTES:
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the journal with only pending and failed entries,
+        call with _file_lock held."""
+        with self._lock:
+            # the rewritten journal includes records that weren't written yet
+            self._unwritten = []
+            lines = []
+            for key, entry in self.pending.items():
+                lines.append(json.dumps({"op": "add", "key": key, "entry": entry}))
+            for key, entry in self.failed.items():
+                lines.append(json.dumps({"op": "add", "key": key, "entry": entry}))
+                lines.append(
+                    json.dumps({"op": "failed", "key": key, "error": entry["error"]})
+                )
+
+        if self._file is not None:
+            self._file.close()
+
+        temp_file = str(JOURNAL_FILE) + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, JOURNAL_FILE)
+
+        self._file = open(JOURNAL_FILE, "a", encoding="utf-8")
+
+    def _schedule(self, delay):
+        """Drain the journal after delay seconds.
+        A scheduled drain is only ever moved earlier, so a stream of finishes
+        can't postpone uploads but new runs don't wait behind a retry backoff."""
+        with self._lock:
+            if self._closed:
+                return
+
+            deadline = time.monotonic() + delay
+            if self._timer is not None:
+                if self._timer_deadline <= deadline:
+                    return
+                self._timer.cancel()
+
+            self._timer = Timer(delay, self._submit_drain)
+            self._timer.args = (self._timer,)
+            self._timer_deadline = deadline
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _submit_drain(self, timer):
+        """Queue a drain on the worker threads."""
+        with self._lock:
+            if timer is not self._timer:
+                # replaced by an earlier drain after it fired
+                return
+            self._timer = None
+
+        if not Executor.instance().submit(Priority.UPLOAD, self._drain):
+            self._schedule(RETRY_BASE)
+
+    def _drain(self):
+        """Upload a batch of due runs, then schedule the next drain."""
+        if not API_CFG["authenticate"]:
+            return
+
+        with self._drain_lock:
+            # journal runs before uploading them
+            self._flush()
+
+            now = time.time()
+            with self._lock:
+                due = [
+                    (key, entry)
+                    for key, entry in self.pending.items()
+                    if entry["next_attempt"] <= now
+                ][:BATCH_SIZE]
+
+            if self.batch and len(due) > 1:
+                self._upload_batch(due)
+            else:
+                for key, entry in due:
+                    self._upload(key, entry)
+            self._flush()
+
+            with self._lock:
+                if not self.pending:
+                    return
+                next_attempt = min(e["next_attempt"] for e in self.pending.values())
+
+            self._schedule(max(0, next_attempt - time.time()))
+
+    def _upload(self, key, entry):
+        """Upload a single run."""
+        try:
+            result, r = add_map_time(
+                entry["map_id"],
+                entry["player_id"],
+                entry["player_class"],
+                entry["start_time"],
+                entry["end_time"],
+                entry["checkpoints"],
+                idempotency_key=key,
+            )
+        except AssertionError:
+            self._finish(key, "failed", error="invalid map time")
+            return
+
+        self.stats["requests"] += 1
+        self._handle(key, entry, result, r.status_code if r is not None else None)
+
+    def _upload_batch(self, due):
+        """Upload runs in one request, results are handled per run."""
+        times = [dict(entry, idempotency_key=key) for key, entry in due]
+        for t in times:
+            for field in ("created", "attempts", "next_attempt"):
+                del t[field]
+
+        try:
+            results, r = add_map_times(times)
+        except AssertionError:
+            # find the invalid runs one by one
+            for key, entry in due:
+                self._upload(key, entry)
+            return
+
+        if r is not None and r.status_code == 404:
+            print("[jtimer] Api has no batch upload endpoint, uploading one by one.")
+            self.batch = False
+            for key, entry in due:
+                self._upload(key, entry)
+            return
+
+        self.stats["requests"] += 1
+        for key, entry in due:
+            if results is not None and key in results:
+                status, result = results[key]
+                self._handle(key, entry, result, status)
+            else:
+                self._handle(key, entry, None, r.status_code if r is not None else None)
+
+    def _handle(self, key, entry, result, status):
+        """Finish, fail or schedule a retry of a run after an upload,
+        status is None if the api was unavailable."""
+        if result is not None:
+            self.stats["runs"] += 1
+            self._finish(key, "done", result=result)
+
+        elif status is not None and 400 <= status < 500 and status not in RETRY_STATUS:
+            self._finish(key, "failed", error=f"api response {status}")
+
+        else:
+            with self._lock:
+                attempts = entry["attempts"] + 1
+                delay = min(RETRY_MAX, RETRY_BASE * 2 ** (attempts - 1))
+                record = {
+                    "op": "retry",
+                    "key": key,
+                    "attempts": attempts,
+                    "next_attempt": time.time() + delay * random.uniform(0.8, 1.2),
+                }
+                self._write(record)
+                self._apply(record)
+
+    def _finish(self, key, op, result=None, error=None):
+        """Record an uploaded or rejected run and call its callback."""
+        with self._lock:
+            record = {"op": op, "key": key}
+            if error is not None:
+                record["error"] = error
+            self._write(record)
+            self._apply(record)
+            callback = self._callbacks.pop(key, None)
+
+        if callback is not None and result is not None:
+            CompletionQueue.instance().post(callback, result)
@@ -3,31 +3,38 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
-# Python Imports
-import requests
-
 # Custom Imports
-from ..config import API_CFG
+from .client import ApiClient
+from .singleflight import single_flight
 
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
+@single_flight("maps")
 def map_info(map_id):
     """Get map info by id.
     https://jtimer-api.readthedocs.io/en/latest/#post--times-insert-map-(int-map_id)"""
     map_ = None
-    r = requests.get(API_CFG["host"] + f"/maps/{map_id}/info")
-    if r.status_code == 200:
+    r = ApiClient.instance().cached_get("maps", f"/maps/{map_id}/info")
+    if r is not None and r.status_code == 200:
         map_ = r.json()
     return map_
 
 
+@single_flight("maps")
 def map_info_name(name):
     """Get map info by name.
     https://jtimer-api.readthedocs.io/en/latest/#get--maps-name-(string-mapname)"""
     map_ = None
-    r = requests.get(API_CFG["host"] + f"/maps/name/{name}")
-    if r.status_code == 200:
+    r = ApiClient.instance().cached_get("maps", f"/maps/name/{name}")
+    if r is not None and r.status_code == 200:
         map_ = r.json()
     return map_, r
+
+
+def forget_map_info(map_id, name):
+    """Drop cached map info, call when the map's records changed."""
+    cache = ApiClient.instance().cache
+    cache.invalidate(f"/maps/{map_id}/info")
+    cache.invalidate(f"/maps/name/{name}")
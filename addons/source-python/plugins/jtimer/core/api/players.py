@@ -5,25 +5,28 @@
 # =============================================================================
 # Python Imports
 import json
-import requests
 
 # Custom Imports
 from ..config import API_CFG
 from ..api import auth
+from .client import ApiClient
+from .singleflight import single_flight
 
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
+@single_flight("players")
 def search_player(player_id=None, steam_id=None, name=None):
     """Search for a player by player_id, steam_id or name.
     https://jtimer-api.readthedocs.io/en/latest/#get--players-search"""
     player = None
-    r = requests.get(
-        API_CFG["host"] + "/players/search",
+    r = ApiClient.instance().cached_get(
+        "players",
+        "/players/search",
         params={"player_id": player_id, "steam_id": steam_id, "name": name},
     )
-    if r.status_code == 200:
+    if r is not None and r.status_code == 200:
         player = r.json()
     return player
 
@@ -32,10 +35,10 @@ def list_players(start=1, limit=50):
     """Get a list of players.
     https://jtimer-api.readthedocs.io/en/latest/#get--players-list"""
     players = []
-    r = requests.get(
-        API_CFG["host"] + "/players/list", params={"start": start, "limit": limit}
+    r = ApiClient.instance().get(
+        "players", "/players/list", params={"start": start, "limit": limit}
     )
-    if r.status_code == 200:
+    if r is not None and r.status_code == 200:
         players = r.json()
     return players
 
@@ -51,8 +54,9 @@ def add_player(steam_id, username, country):
         return None
 
     player = None
-    r = requests.post(
-        API_CFG["host"] + "/players/add",
+    r = ApiClient.instance().post(
+        "players.add",
+        "/players/add",
         headers={
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
@@ -62,7 +66,9 @@ def add_player(steam_id, username, country):
         ),
     )
 
-    if r.status_code == 200:
+    if r is None:
+        print("[jtimer] Failed to add/update player, api unavailable.")
+    elif r.status_code == 200:
         player = r.json()
     else:
         print("[jtimer] Failed to add/update player.")
@@ -0,0 +1,85 @@
+"""Module for sharing identical concurrent api reads."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from functools import wraps
+from threading import Event, Lock
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# {(function name, args, kwargs): _Flight}
+_flights = {}
+_flights_lock = Lock()
+
+# {endpoint: {"calls": calls made, "shared": calls that joined another's request}}
+flight_stats = {}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def single_flight(endpoint):
+    """Decorator for api reads.
+    Calls with the same arguments while one is already running wait for it
+    and get its result instead of sending their own request."""
+
+    def decorator(function):
+        stats = flight_stats.setdefault(endpoint, {"calls": 0, "shared": 0})
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            key = (function.__qualname__, args, tuple(sorted(kwargs.items())))
+
+            with _flights_lock:
+                stats["calls"] += 1
+                flight = _flights.get(key)
+                if flight is not None:
+                    stats["shared"] += 1
+                    leader = False
+                else:
+                    flight = _flights[key] = _Flight()
+                    leader = True
+
+            if not leader:
+                return flight.wait()
+
+            try:
+                flight.result = function(*args, **kwargs)
+            except Exception as e:
+                flight.error = e
+                raise
+            finally:
+                with _flights_lock:
+                    del _flights[key]
+                flight.done.set()
+
+            return flight.result
+
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# >> FLIGHT CLASS
+# =============================================================================
+class _Flight:
+    """A running api read."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        """Create a new running flight."""
+        self.done = Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        """Wait for the result, raises if the request raised."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
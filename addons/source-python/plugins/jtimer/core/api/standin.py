@@ -0,0 +1,115 @@
+"""Module for a local stand-in of the api's time upload endpoints."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+import json
+import re
+import time
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+SINGLE_PATH = re.compile(r"^/times/insert/map/(\d+)$")
+BATCH_PATH = "/times/insert/batch"
+
+
+# =============================================================================
+# >> STAND-IN SERVER CLASS
+# =============================================================================
+class StandInServer:
+    """Local http server answering time uploads like the api does.
+    Every request waits latency seconds to stand in for the round trip
+    and TLS overhead of the real api.
+    Used as a context manager, url is set while it's running."""
+
+    def __init__(self, latency=0.05):
+        """Create a new stopped StandInServer."""
+        self.latency = latency
+        self.url = None
+        # requests and times received
+        self.stats = {"requests": 0, "times": 0}
+        self._lock = Lock()
+        self._server = None
+
+    def __enter__(self):
+        """Start serving on a free local port."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        Thread(
+            target=self._server.serve_forever, name="jtimer-standin", daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self.url = None
+
+    def insert(self, time_):
+        """Return the api result of an inserted time."""
+        duration = time_["end_time"] - time_["start_time"]
+        with self._lock:
+            self.stats["times"] += 1
+            rank = self.stats["times"]
+        return {
+            "result": 2,
+            "rank": rank,
+            "duration": duration,
+            "points_gained": 0,
+            "completions": {"soldier": rank, "demoman": rank},
+            "records": {"soldier": None, "demoman": None},
+        }
+
+
+def _handler(standin):
+    """Return a request handler class bound to a StandInServer."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        """Answers single and batched time uploads."""
+
+        def do_POST(self):
+            """Handle an upload."""
+            with standin._lock:
+                standin.stats["requests"] += 1
+            time.sleep(standin.latency)
+
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+
+            if SINGLE_PATH.match(self.path):
+                self._reply(200, standin.insert(body))
+
+            elif self.path == BATCH_PATH:
+                results = [
+                    {
+                        "idempotency_key": t["idempotency_key"],
+                        "status": 200,
+                        "result": standin.insert(t),
+                    }
+                    for t in body["times"]
+                ]
+                self._reply(200, {"results": results})
+
+            else:
+                self._reply(404, {"message": "not found"})
+
+        def _reply(self, status, data):
+            """Send a json response."""
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Don't log requests to the server console."""
+
+    return _Handler
@@ -5,16 +5,18 @@
 # =============================================================================
 # Python Imports
 import json
-import requests
 
 # Custom Imports
 from ..config import API_CFG
 from .auth import get_token
+from .client import ApiClient
+from .singleflight import single_flight
 
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
+@single_flight("times")
 def map_times(map_id, start=1, limit=50):
     """Get map times from the api.
     https://jtimer-api.readthedocs.io/en/latest/#get--times-map-(int-map_id)"""
@@ -23,46 +25,54 @@ def map_times(map_id, start=1, limit=50):
     assert limit <= 50
 
     times = None
-    r = requests.get(
-        API_CFG["host"] + f"/times/map/{map_id}",
+    r = ApiClient.instance().cached_get(
+        "times",
+        f"/times/map/{map_id}",
         params={"start": start, "limit": limit},
     )
-    if r.status_code == 200:
+    if r is not None and r.status_code == 200:
         times = r.json()
     return times
 
 
-def add_map_time(map_id, player_id, player_class, start_time, end_time, checkpoints=[]):
+def forget_map_times(map_id):
+    """Drop cached map times, call after a time was added."""
+    ApiClient.instance().cache.invalidate(f"/times/map/{map_id}")
+
+
+def add_map_time(
+    map_id,
+    player_id,
+    player_class,
+    start_time,
+    end_time,
+    checkpoints=[],
+    idempotency_key=None,
+):
     """Add time to map.
+    Retries with the same idempotency_key are only inserted once.
+    Returns (result, response), response is None if the api is unavailable.
     https://jtimer-api.readthedocs.io/en/latest/#post--times-insert-map-(int-map_id)"""
     if not API_CFG["authenticate"]:
-        return None
+        return None, None
 
-    assert map_id > 0
-    assert player_id > 0
-    assert player_class in [2, 4]
-    assert 0 < start_time < end_time
-    assert isinstance(checkpoints, list)
-    for checkpoint in checkpoints:
-        cp_index = checkpoint.get("cp_index")
-        assert cp_index is not None and isinstance(cp_index, int) and cp_index > 0
-        cp_time = checkpoint.get("time")
-        assert (
-            cp_time is not None
-            and isinstance(cp_time, float)
-            and start_time < cp_time < end_time
-        )
+    check_map_time(map_id, player_id, player_class, start_time, end_time, checkpoints)
 
     access_token = get_token()
     if access_token is None:
-        return None
+        return None, None
 
-    r = requests.post(
-        API_CFG["host"] + f"/times/insert/map/{map_id}",
-        headers={
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        },
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+    }
+    if idempotency_key is not None:
+        headers["Idempotency-Key"] = idempotency_key
+
+    r = ApiClient.instance().post(
+        "times.insert",
+        f"/times/insert/map/{map_id}",
+        headers=headers,
         data=json.dumps(
             {
                 "player_id": player_id,
@@ -75,11 +85,82 @@ def add_map_time(map_id, player_id, player_class, start_time, end_time, checkpoi
     )
 
     result = None
-    if r.status_code == 200:
+    if r is None:
+        print(f"[jtimer] failed to upload map time, api unavailable.")
+    elif r.status_code == 200:
         result = r.json()
     else:
         print(f"[jtimer] failed to upload map time.")
         print(f"api response: {r.status_code}")
         print(r.content)
 
-    return result
+    return result, r
+
+
+def add_map_times(times):
+    """Add many times in one request.
+    times is a list of dicts with the add_map_time arguments as keys.
+    Returns ({idempotency_key: (status, result)}, response),
+    response is None if the api is unavailable.
+    POST /times/insert/batch
+    {"times": [{"map_id": .., "idempotency_key": .., ...}]}
+    -> {"results": [{"idempotency_key": .., "status": .., "result": ..}]}"""
+    if not API_CFG["authenticate"]:
+        return None, None
+
+    for t in times:
+        check_map_time(
+            t["map_id"],
+            t["player_id"],
+            t["player_class"],
+            t["start_time"],
+            t["end_time"],
+            t["checkpoints"],
+        )
+
+    access_token = get_token()
+    if access_token is None:
+        return None, None
+
+    r = ApiClient.instance().post(
+        "times.insert",
+        "/times/insert/batch",
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        },
+        data=json.dumps({"times": times}),
+    )
+
+    results = None
+    if r is None:
+        print(f"[jtimer] failed to upload map times, api unavailable.")
+    elif r.status_code == 200:
+        results = {
+            item["idempotency_key"]: (item["status"], item.get("result"))
+            for item in r.json()["results"]
+        }
+    elif r.status_code != 404:
+        print(f"[jtimer] failed to upload map times.")
+        print(f"api response: {r.status_code}")
+        print(r.content)
+
+    return results, r
+
+
+def check_map_time(map_id, player_id, player_class, start_time, end_time, checkpoints):
+    """Raise AssertionError if a map time can't be uploaded."""
+    assert map_id > 0
+    assert player_id > 0
+    assert player_class in [2, 4]
+    assert 0 < start_time < end_time
+    assert isinstance(checkpoints, list)
+    for checkpoint in checkpoints:
+        cp_index = checkpoint.get("cp_index")
+        assert cp_index is not None and isinstance(cp_index, int) and cp_index > 0
+        cp_time = checkpoint.get("time")
+        assert (
+            cp_time is not None
+            and isinstance(cp_time, float)
+            and start_time < cp_time < end_time
+        )
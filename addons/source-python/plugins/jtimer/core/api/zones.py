@@ -3,21 +3,20 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
-# Python Imports
-import requests
-
 # Custom Imports
-from ..config import API_CFG
+from .client import ApiClient
+from .singleflight import single_flight
 
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
+@single_flight("zones")
 def map_zones(map_id):
     """Get map zones from the api.
     https://jtimer-api.readthedocs.io/en/latest/#get--zones-map-(int-map_id)"""
     zones = None
-    r = requests.get(API_CFG["host"] + f"/zones/map/{map_id}")
-    if r.status_code == 200:
+    r = ApiClient.instance().cached_get("zones", f"/zones/map/{map_id}")
+    if r is not None and r.status_code == 200:
         zones = r.json()
     return zones, r
@@ -48,6 +48,7 @@ message_map_record_set = SayText2(chat_strings["map record set"])
 message_points_gain = SayText2(chat_strings["points gain"])
 
 message_no_match = SayText2(chat_strings["no match"])
+message_busy = SayText2(chat_strings["busy"])
 
 message_player_join = SayText2(chat_strings["player join"])
 message_player_join_unranked = SayText2(chat_strings["player join unranked"])
@@ -91,6 +92,7 @@ __all__ = (
     message_map_record_set,
     message_points_gain,
     message_no_match,
+    message_busy,
     message_player_join,
     message_player_join_unranked,
     message_hidechat_on,
@@ -0,0 +1,258 @@
+"""Module for registering server console commands."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+import os
+import time
+
+# Source.Python Imports
+from commands.typed import TypedServerCommand
+
+# Custom Imports
+from ..timer.timer import Timer
+from ..timer.scheduler import Scheduler
+from ..timer.load import LoadController
+from ..helpers import bench
+from ..zones.zone import expanded_cache_stats
+from ..hud.hud import hud_stats
+from ..config import TIMER_CFG
+from ..api.client import ApiClient, LATENCY_BUCKETS
+from ..api.singleflight import flight_stats
+from ..helpers.executor import Executor
+from ..helpers.completions import CompletionQueue
+from ..api.journal import UploadJournal, JOURNAL_FILE
+from ..map.loader import MapLoader, STAGES
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand(["jtimer", "stats"])
+def _stats_handler(command_info):
+    """Print runtime statistics."""
+    hits = expanded_cache_stats["hits"]
+    misses = expanded_cache_stats["misses"]
+    lookups = hits + misses
+    hit_rate = hits / lookups * 100 if lookups else 0.0
+    print(
+        f"[jtimer] Hull expanded zone cache\n"
+        f"hits: {hits}, misses: {misses}, hit rate: {hit_rate:.2f}%"
+    )
+
+    sent = hud_stats["sent"]
+    skipped = hud_stats["skipped"]
+    total = sent + skipped
+    skip_rate = skipped / total * 100 if total else 0.0
+    print(
+        f"[jtimer] Hud messages\n"
+        f"sent: {sent}, skipped unchanged: {skipped}, skip rate: {skip_rate:.2f}%"
+    )
+
+    update_stats = Timer.instance().update_stats
+    ticks = update_stats["ticks"]
+    average = update_stats["seconds"] / ticks * 1000000 if ticks else 0.0
+    print(
+        f"[jtimer] Timer updates ({TIMER_CFG['zone_backend']} zone backend)\n"
+        f"ticks: {ticks}, average: {average:.1f}us"
+    )
+
+
+@TypedServerCommand(["jtimer", "jobs"])
+def _jobs_handler(command_info):
+    """Print timings of scheduled jobs."""
+    print("[jtimer] Scheduled jobs")
+    for job in Scheduler.instance().jobs:
+        average = job.seconds / job.calls * 1000000 if job.calls else 0.0
+        print(
+            f"{job.name}: every {job.interval}s, runs: {job.calls}, "
+            f"average: {average:.1f}us, max: {job.max_seconds * 1000000:.1f}us"
+        )
+
+
+@TypedServerCommand(["jtimer", "load"])
+def _load_handler(command_info):
+    """Print current load level."""
+    load = LoadController.instance()
+    print(
+        f"[jtimer] Load level: {load.level.name} ({int(load.level)})\n"
+        f"average: {load.average * 1000:.2f}ms, budget: {load.budget * 1000:.2f}ms, "
+        f"deferred: {len(load.deferred)}, dropped: {load.dropped}"
+    )
+
+
+@TypedServerCommand(["jtimer", "api"])
+def _api_handler(command_info):
+    """Print api latencies and circuit breaker state."""
+    client = ApiClient.instance()
+    print(
+        f"[jtimer] Api circuit breaker: {client.breaker.state}, "
+        f"failures in a row: {client.breaker.failures}, "
+        f"rejected: {client.breaker.rejected}"
+    )
+
+    labels = [f"<{bound}ms" for bound in LATENCY_BUCKETS] + [
+        f">{LATENCY_BUCKETS[-1]}ms"
+    ]
+    for endpoint, histogram in sorted(client.latencies.items()):
+        average = histogram.seconds / histogram.requests * 1000
+        buckets = ", ".join(
+            f"{label}: {count}"
+            for label, count in zip(labels, histogram.counts)
+            if count
+        )
+        print(
+            f"{endpoint}: requests: {histogram.requests}, "
+            f"failed: {histogram.failures}, average: {average:.1f}ms\n  {buckets}"
+        )
+
+    stats = client.cache.stats
+    print(
+        f"[jtimer] Api response cache: {client.cache.size} bytes\n"
+        f"fresh: {stats['fresh']}, stale: {stats['stale']}, "
+        f"revalidated: {stats['revalidated']}, misses: {stats['misses']}"
+    )
+
+    print("[jtimer] Api reads shared with an identical running request")
+    for endpoint, stats in sorted(flight_stats.items()):
+        print(f"{endpoint}: calls: {stats['calls']}, shared: {stats['shared']}")
+
+
+@TypedServerCommand(["jtimer", "workers"])
+def _workers_handler(command_info):
+    """Print worker queue depths."""
+    executor = Executor.instance()
+    print("[jtimer] Worker queues")
+    for priority, queued in executor.queued.items():
+        print(
+            f"{priority.name.lower()}: queued: {queued}, "
+            f"rejected: {executor.rejected[priority]}"
+        )
+
+    completions = CompletionQueue.instance()
+    print(
+        f"main thread: waiting: {len(completions)}, "
+        f"completed: {completions.completed}, "
+        f"ticks over budget: {completions.overruns}"
+    )
+
+
+@TypedServerCommand(["jtimer", "uploads"])
+def _uploads_handler(command_info):
+    """Print pending and failed map time uploads."""
+    journal = UploadJournal.instance()
+    size = os.path.getsize(JOURNAL_FILE) if os.path.exists(JOURNAL_FILE) else 0
+    print(
+        f"[jtimer] Upload journal: {len(journal.pending)} pending, "
+        f"{len(journal.failed)} failed, {size} bytes"
+    )
+    runs = journal.stats["runs"]
+    requests = journal.stats["requests"]
+    per_request = runs / requests if requests else 0.0
+    print(
+        f"batch mode: {'on' if journal.batch else 'off'}, uploaded: {runs} times "
+        f"in {requests} requests ({per_request:.2f} per request)"
+    )
+
+    now = time.time()
+    for key, entry in list(journal.pending.items()):
+        wait = max(0, entry["next_attempt"] - now)
+        print(
+            f"pending {key}: map {entry['map_id']}, player {entry['player_id']}, "
+            f"attempts: {entry['attempts']}, next in {wait:.0f}s"
+        )
+    for key, entry in list(journal.failed.items()):
+        print(
+            f"failed  {key}: map {entry['map_id']}, player {entry['player_id']}, "
+            f"{entry['error']}"
+        )
+
+
+@TypedServerCommand(["jtimer", "mapload"])
+def _mapload_handler(command_info):
+    """Print map loading stage timings."""
+    loader = MapLoader.instance()
+    status = f"loading ({loader.stage})" if loader.stage else "idle"
+    print(
+        f"[jtimer] Map loader: {status}, map: {loader.map_name}, "
+        f"ready: {'yes' if loader.ready else 'no'}, generation: {loader.generation}"
+    )
+    for stage in STAGES:
+        if stage in loader.timings:
+            print(f"{stage}: {loader.timings[stage] * 1000:.1f}ms")
+
+
+@TypedServerCommand(["jtimer", "bench", "zones"])
+def _bench_zones_handler(command_info, iterations: int = 10000):
+    """Compare zone grid lookups against a linear scan."""
+    current_map = Timer.instance().current_map
+    if current_map is None:
+        print("[jtimer] No zoned map loaded.")
+        return
+
+    linear_time, grid_time, mismatches = bench.bench_zone_index(
+        current_map, iterations
+    )
+    print(
+        f"[jtimer] {iterations} lookups over {len(current_map.zone_grid.zones)} zones\n"
+        f"linear scan: {linear_time * 1000:.2f}ms\n"
+        f"zone grid:   {grid_time * 1000:.2f}ms\n"
+        f"mismatches:  {mismatches}"
+    )
+
+
+@TypedServerCommand(["jtimer", "bench", "subtick"])
+def _bench_subtick_handler(command_info, iterations: int = 10000):
+    """Compare Zone.time_to_zone_edge against the Vector based reference."""
+    current_map = Timer.instance().current_map
+    if current_map is None:
+        print("[jtimer] No zoned map loaded.")
+        return
+
+    reference_time, current_time, mismatches = bench.bench_time_to_zone_edge(
+        current_map, iterations
+    )
+    print(
+        f"[jtimer] {iterations} subtick calculations\n"
+        f"reference:  {reference_time * 1000:.2f}ms\n"
+        f"current:    {current_time * 1000:.2f}ms\n"
+        f"mismatches: {mismatches}"
+    )
+
+
+@TypedServerCommand(["jtimer", "bench", "reset"])
+def _bench_reset_handler(command_info, iterations: int = 1000):
+    """Compare allocating new player States to resetting existing ones."""
+    fresh, reuse = bench.bench_state_reset(iterations=iterations)
+    print(f"[jtimer] {iterations} resets of 32 player states")
+    for name, (seconds, peak) in (("new", fresh), ("reset", reuse)):
+        print(f"{name + ':':<7}{seconds * 1000:.2f}ms, peak {peak} bytes")
+
+
+@TypedServerCommand(["jtimer", "bench", "uploads"])
+def _bench_uploads_handler(command_info, runs: int = 100, latency: int = 50):
+    """Compare single and batched uploads against a local stand-in api,
+    latency is the simulated round trip per request in ms."""
+    single, batched = bench.bench_uploads(runs, latency / 1000)
+    print(f"[jtimer] {runs} uploads, {latency}ms per request")
+    for name, (seconds, requests) in (("single:", single), ("batched:", batched)):
+        print(
+            f"{name:<9}{requests} requests, {seconds * 1000:.0f}ms, "
+            f"{runs / seconds:.1f} times/s"
+        )
+
+
+@TypedServerCommand(["jtimer", "bench", "timestamp"])
+def _bench_timestamp_handler(command_info, iterations: int = 100000):
+    """Compare ticks_to_timestamp against the float based reference."""
+    reference_time, current_time, batch_time, mismatches = bench.bench_timestamp(
+        iterations
+    )
+    print(
+        f"[jtimer] {iterations * 3} timestamps\n"
+        f"reference:  {reference_time * 1000:.2f}ms\n"
+        f"current:    {current_time * 1000:.2f}ms\n"
+        f"batch:      {batch_time * 1000:.2f}ms\n"
+        f"mismatches: {mismatches}"
+    )
@@ -31,10 +31,42 @@ try:
 except ValueError:
     API_CFG["authenticate"] = False
 
+try:
+    API_CFG["batch_uploads"] = PARSER.getboolean("api", "batch_uploads", fallback=False)
+except ValueError:
+    API_CFG["batch_uploads"] = False
+
 if API_CFG["authenticate"]:
     assert "username" in API_CFG
     assert "password" in API_CFG
 
+# timer
+TIMER_CFG = dict(PARSER.items("timer")) if PARSER.has_section("timer") else {}
+
+# convert to bool
+try:
+    TIMER_CFG["batch_zones"] = PARSER.getboolean("timer", "batch_zones", fallback=False)
+except ValueError:
+    TIMER_CFG["batch_zones"] = False
+
+TIMER_CFG["zone_backend"] = PARSER.get("timer", "zone_backend", fallback="polling")
+if TIMER_CFG["zone_backend"] not in ("polling", "triggers"):
+    TIMER_CFG["zone_backend"] = "polling"
+
+# jtimer's own work per tick in ms before shedding load
+try:
+    TIMER_CFG["tick_budget"] = PARSER.getfloat("timer", "tick_budget", fallback=3.0)
+except ValueError:
+    TIMER_CFG["tick_budget"] = 3.0
+
+# time in ms per tick for running worker results on the main thread
+try:
+    TIMER_CFG["completion_budget"] = PARSER.getfloat(
+        "timer", "completion_budget", fallback=2.0
+    )
+except ValueError:
+    TIMER_CFG["completion_budget"] = 2.0
+
 # cvars
 CVAR_CFG = dict(PARSER.items("cvar"))
 for cvar in CVAR_CFG.keys():
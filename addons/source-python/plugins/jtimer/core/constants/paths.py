@@ -6,7 +6,11 @@ instead of /resource/source-python/translations/chat_strings.ini"""
 # >> IMPORTS
 # =============================================================================
 # Source.Python Imports
-from paths import TRANSLATION_PATH as _TRANSLATION_PATH, CFG_PATH as _CFG_PATH
+from paths import (
+    TRANSLATION_PATH as _TRANSLATION_PATH,
+    CFG_PATH as _CFG_PATH,
+    PLUGIN_DATA_PATH as _PLUGIN_DATA_PATH,
+)
 
 # Custom Imports
 from .info import info
@@ -14,10 +18,11 @@ from .info import info
 # =============================================================================
 # >> ALL DECLARATION
 # =============================================================================
-__all__ = ("TRANSLATION_PATH", "CFG_PATH")
+__all__ = ("TRANSLATION_PATH", "CFG_PATH", "DATA_PATH")
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
 TRANSLATION_PATH = _TRANSLATION_PATH / info.name
 CFG_PATH = _CFG_PATH / info.name
+DATA_PATH = _PLUGIN_DATA_PATH / info.name
@@ -0,0 +1,303 @@
+"""Module for benchmarking timer internals.
+The repo has no test suite, so the bench commands double as equivalence checks:
+each compares an optimized path against its reference and counts mismatches,
+run them with 'jtimer bench ...' on a server with a zoned map loaded."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+import math
+import random
+import time
+import tracemalloc
+import uuid
+import requests
+
+# Source.Python Imports
+from engines.server import server
+from mathlib import Vector
+
+# Custom Imports
+from ..players.state import State
+from ..zones.zone import max_tick_distance
+from ..api.journal import BATCH_SIZE
+from ..api.standin import StandInServer
+from .converts import ticks_to_timestamp, ticks_to_timestamps
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# half-widths of a standing player hull
+PLAYER_EXTENTS = Vector(24.0, 24.0, 41.0)
+
+# how far outside the zones to place sample positions
+SAMPLE_MARGIN = 1024
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def bench_zone_index(current_map, iterations=10000):
+    """Compare zone grid lookups to a linear scan over all zones.
+    Returns (linear seconds, grid seconds, mismatches)."""
+    grid = current_map.zone_grid
+    samples = _sample_positions(grid.zones, iterations)
+
+    start = time.perf_counter()
+    linear = [
+        {zone for zone in grid.zones if zone.is_overlapping(center, PLAYER_EXTENTS)}
+        for center in samples
+    ]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [grid.overlapping(center, PLAYER_EXTENTS) for center in samples]
+    grid_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(linear, indexed) if a != b)
+    return linear_time, grid_time, mismatches
+
+
+def bench_time_to_zone_edge(current_map, iterations=10000):
+    """Compare Zone.time_to_zone_edge to the Vector based reference.
+    Returns (reference seconds, current seconds, mismatches)."""
+    zones = current_map.zone_grid.zones
+    centers = _sample_positions(zones, iterations)
+    velocities = [
+        Vector(*[random.uniform(-3500.0, 3500.0) for i in range(3)])
+        for x in range(0, iterations)
+    ]
+    samples = [
+        (random.choice(zones), center, velocity, random.uniform(0.0, 100.0))
+        for center, velocity in zip(centers, velocities)
+    ]
+
+    start = time.perf_counter()
+    reference = [
+        _time_to_zone_edge_reference(zone, center, PLAYER_EXTENTS, velocity, delta)
+        for zone, center, velocity, delta in samples
+    ]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = [
+        zone.time_to_zone_edge(center, PLAYER_EXTENTS, velocity, delta)
+        for zone, center, velocity, delta in samples
+    ]
+    current_time = time.perf_counter() - start
+
+    # nan != nan, compare reprs to be bit exact
+    mismatches = sum(1 for a, b in zip(reference, current) if repr(a) != repr(b))
+    return reference_time, current_time, mismatches
+
+
+def bench_state_reset(players=32, iterations=1000):
+    """Compare creating new States to resetting existing ones in place.
+    Returns ((seconds, peak bytes) for new, same for reset)."""
+
+    def fresh():
+        for x in range(0, iterations):
+            states = [State(None) for i in range(0, players)]
+        return states
+
+    def reuse():
+        states = [State(None) for i in range(0, players)]
+        for x in range(0, iterations):
+            for state in states:
+                state.clear()
+
+    return _measure(fresh), _measure(reuse)
+
+
+def bench_timestamp(iterations=100000):
+    """Compare ticks_to_timestamp to the float based reference
+    over random whole and subtick values, cold and cached.
+    Returns (reference seconds, current seconds, batch seconds, mismatches)."""
+    samples = [random.randint(-100, 66 * 60 * 60 * 12) for x in range(iterations)]
+    samples += [random.uniform(-100.0, 66.0 * 60 * 60 * 12) for x in range(iterations)]
+    # leaderboard pages repeat the same record times
+    samples += random.choices(samples, k=iterations)
+
+    start = time.perf_counter()
+    reference = [_ticks_to_timestamp_reference(ticks) for ticks in samples]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = [ticks_to_timestamp(ticks) for ticks in samples]
+    current_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ticks_to_timestamps(samples)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for a, b, c in zip(reference, current, batch) if not a == b == c
+    )
+    return reference_time, current_time, batch_time, mismatches
+
+
+def bench_uploads(runs=100, latency=0.05):
+    """Upload a burst of finished runs to a local stand-in api
+    one request per run and in batches like the upload journal does.
+    Returns ((seconds, requests) one by one, same batched)."""
+    times = _sample_times(runs)
+    session = requests.Session()
+
+    def single(url):
+        for t in times:
+            body = dict(t)
+            map_id = body.pop("map_id")
+            key = body.pop("idempotency_key")
+            session.post(
+                f"{url}/times/insert/map/{map_id}",
+                headers={"Idempotency-Key": key},
+                json=body,
+            ).raise_for_status()
+
+    def batched(url):
+        for i in range(0, len(times), BATCH_SIZE):
+            session.post(
+                f"{url}/times/insert/batch", json={"times": times[i : i + BATCH_SIZE]}
+            ).raise_for_status()
+
+    results = []
+    for upload in (single, batched):
+        with StandInServer(latency) as standin:
+            start = time.perf_counter()
+            upload(standin.url)
+            results.append((time.perf_counter() - start, standin.stats["requests"]))
+
+    session.close()
+    return results[0], results[1]
+
+
+def _measure(function):
+    """Time a function and track the peak memory it allocates."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def _time_to_zone_edge_reference(zone, other_center, other_extents, velocity, delta):
+    """Zone.time_to_zone_edge as it was before the scalar rewrite."""
+    if delta > max_tick_distance():
+        return 1.0
+
+    corner = Vector(0.0, 0.0, 0.0)
+    for i in range(0, 3):
+        if zone.center[i] < other_center[i]:
+            corner[i] = other_center[i] - other_extents[i]
+        else:
+            corner[i] = other_center[i] + other_extents[i]
+
+    direction = Vector.normalized(velocity)
+
+    dirfrac = [0.0, 0.0, 0.0]
+    for i in range(0, 3):
+        if direction[i] == 0.0:
+            dirfrac[i] = float("inf")
+        else:
+            dirfrac[i] = 1.0 / direction[i]
+
+    vt0 = [0.0, 0.0, 0.0]
+    for i in range(0, 3):
+        vt0[i] = (zone.bounds[0][i] - corner[i]) * dirfrac[i]
+
+    vt1 = [0.0, 0.0, 0.0]
+    for i in range(0, 3):
+        vt1[i] = (zone.bounds[1][i] - corner[i]) * dirfrac[i]
+
+    tmin = abs(
+        max(max(min(vt0[0], vt1[0]), min(vt0[1], vt1[1])), min(vt0[2], vt1[2]))
+    )
+    tmax = min(min(max(vt0[0], vt1[0]), max(vt0[1], vt1[1])), max(vt0[2], vt1[2]))
+
+    if tmax < 0:
+        dist = tmax
+    else:
+        dist = min(tmin, tmax)
+
+    try:
+        time_ = dist / (velocity.length * server.tick_interval)
+    except ZeroDivisionError:
+        return 1
+
+    return max(0, min(time_, 1))
+
+
+def _ticks_to_timestamp_reference(ticks):
+    """ticks_to_timestamp as it was before the integer rewrite."""
+    ticks = abs(ticks)
+
+    milliseconds, seconds = math.modf(ticks * server.tick_interval)
+    minutes = math.floor(seconds / 60)
+    hours = math.floor(minutes / 60)
+
+    seconds -= minutes * 60
+    minutes -= hours * 60
+
+    timestamp = ""
+
+    if 0 < hours < 10:
+        timestamp += f"0{hours}:"
+    elif hours >= 10:
+        timestamp += f"{hours}:"
+
+    if minutes == 0 or 0 < minutes < 10:
+        timestamp += f"0{minutes}:"
+    elif minutes >= 10:
+        timestamp += f"{minutes}:"
+
+    if seconds == 0 or 0 < seconds < 10:
+        timestamp += f"0{str(seconds)[0]}."
+    elif seconds >= 10:
+        timestamp += f"{str(seconds)[:2]}."
+
+    if milliseconds == 0:
+        timestamp += f"00"
+    elif milliseconds > 0:
+        timestamp += str(milliseconds)[2:4]
+
+    return timestamp
+
+
+def _sample_positions(zones, count):
+    """Random positions around and inside zones."""
+    mins = [min(z.bounds[0][i] for z in zones) - SAMPLE_MARGIN for i in range(3)]
+    maxs = [max(z.bounds[1][i] for z in zones) + SAMPLE_MARGIN for i in range(3)]
+
+    samples = []
+    for x in range(0, count):
+        if x % 4 == 0:
+            # bias some samples into zones so overlaps get tested
+            zone = random.choice(zones)
+            lower, upper = zone.bounds
+        else:
+            lower, upper = mins, maxs
+
+        samples.append(Vector(*[random.uniform(lower[i], upper[i]) for i in range(3)]))
+    return samples
+
+
+def _sample_times(count):
+    """Random finished runs in the add_map_times format."""
+    times = []
+    for x in range(0, count):
+        start_time = random.uniform(1000.0, 100000.0)
+        times.append(
+            {
+                "map_id": random.randint(1, 500),
+                "player_id": random.randint(1, 10000),
+                "player_class": random.choice([2, 4]),
+                "start_time": start_time,
+                "end_time": start_time + random.uniform(500.0, 50000.0),
+                "checkpoints": [],
+                "idempotency_key": uuid.uuid4().hex,
+            }
+        )
+    return times
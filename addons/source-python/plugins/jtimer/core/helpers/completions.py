@@ -0,0 +1,73 @@
+"""Module for handing results from worker threads to the main thread."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from collections import deque
+import time
+import traceback
+
+# Custom Imports
+from ..config import TIMER_CFG
+
+
+# =============================================================================
+# >> COMPLETION QUEUE CLASS
+# =============================================================================
+class CompletionQueue:
+    """Singleton CompletionQueue class.
+    Worker threads post calls here, they're run on the main thread in on_tick
+    so everything touching the engine or timer state happens there."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if CompletionQueue.__instance is None:
+            CompletionQueue()
+        return CompletionQueue.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if CompletionQueue.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        self.budget = TIMER_CFG["completion_budget"] / 1000
+        # deque appends and pops are thread safe
+        self._calls = deque()
+        self.completed = 0
+        # ticks that ran out of budget with calls left
+        self.overruns = 0
+        CompletionQueue.__instance = self
+
+    def __len__(self):
+        """Number of calls waiting."""
+        return len(self._calls)
+
+    def post(self, function, *args, **kwargs):
+        """Call function on the main thread, can be called from any thread."""
+        self._calls.append((function, args, kwargs))
+
+    def drain(self):
+        """Run posted calls until the budget for this tick is used up.
+        At least one call is run so the queue can't stall."""
+        if not self._calls:
+            return
+
+        deadline = time.perf_counter() + self.budget
+        while self._calls:
+            function, args, kwargs = self._calls.popleft()
+            try:
+                function(*args, **kwargs)
+            except Exception:
+                # partials have no __qualname__
+                name = getattr(function, "__qualname__", repr(function))
+                print(f"[jtimer] Exception in completion {name}:")
+                traceback.print_exc()
+            self.completed += 1
+
+            if time.perf_counter() >= deadline:
+                if self._calls:
+                    self.overruns += 1
+                return
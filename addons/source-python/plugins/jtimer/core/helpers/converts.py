@@ -4,7 +4,7 @@
 # >> IMPORTS
 # =============================================================================
 # Python Imports
-import math
+from functools import lru_cache
 
 # Source.Python Imports
 from players.dictionary import PlayerDictionary
@@ -12,29 +12,27 @@ from engines.server import server
 
 # Custom Imports
 from ..timer import timer
-from .utils import get_players
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
 player_instances = PlayerDictionary()
 
+# formatted durations to keep, record times are formatted over and over
+TIMESTAMP_CACHE_SIZE = 4096
+
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
 def steamid_to_player(steamid):
     """Convert steamid to player."""
-    for player in timer.Timer.instance().players:
-        if player.steamid == steamid:
-            return player
-    return None
+    return timer.Timer.instance().player_by_steamid(steamid)
 
 
 def userid_to_player(userid):
     """Conver userid to player."""
-    steamid = userid_to_source_player(userid).raw_steamid.to_steamid2()
-    return steamid_to_player(steamid)
+    return timer.Timer.instance().player_by_userid(userid)
 
 
 def userid_to_source_player(userid):
@@ -47,48 +45,40 @@ def userid_to_source_player(userid):
 
 def index_to_source_player(index):
     """Convert index to Source.Python player."""
-    for player in get_players():
-        if player.index == index:
-            return player
+    try:
+        return player_instances[index]
+    except ValueError:
+        return None
 
 
 def index_to_player(index):
-    source_player = index_to_source_player(index)
-    if source_player:
-        return steamid_to_player(source_player.raw_steamid.to_steamid2())
+    return timer.Timer.instance().player_by_index(index)
 
 
 def ticks_to_timestamp(ticks):
     """Convert ticks to a timestamp."""
-    ticks = abs(ticks)
-
-    milliseconds, seconds = math.modf(ticks * server.tick_interval)
-    minutes = math.floor(seconds / 60)
-    hours = math.floor(minutes / 60)
+    return _format_timestamp(abs(ticks) * server.tick_interval)
 
-    seconds -= minutes * 60
-    minutes -= hours * 60
 
-    timestamp = ""
+def ticks_to_timestamps(ticks_list):
+    """Convert many ticks to timestamps, e.g. for a page of times."""
+    tick_interval = server.tick_interval
+    return [_format_timestamp(abs(ticks) * tick_interval) for ticks in ticks_list]
 
-    if 0 < hours < 10:
-        timestamp += f"0{hours}:"
-    elif hours >= 10:
-        timestamp += f"{hours}:"
 
-    if minutes == 0 or 0 < minutes < 10:
-        timestamp += f"0{minutes}:"
-    elif minutes >= 10:
-        timestamp += f"{minutes}:"
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _format_timestamp(duration):
+    """Format a duration in seconds as [hh:]mm:ss.xx"""
+    whole = int(duration)
+    # exact, same as math.modf
+    fraction = duration - whole
 
-    if seconds == 0 or 0 < seconds < 10:
-        timestamp += f"0{str(seconds)[0]}."
-    elif seconds >= 10:
-        timestamp += f"{str(seconds)[:2]}."
+    minutes, seconds = divmod(whole, 60)
+    hours, minutes = divmod(minutes, 60)
 
-    if milliseconds == 0:
-        timestamp += f"00"
-    elif milliseconds > 0:
-        timestamp += str(milliseconds)[2:4]
+    # first two digits of the fraction, truncated like before
+    hundredths = str(fraction)[2:4] if fraction else "00"
 
-    return timestamp
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{hundredths}"
+    return f"{minutes:02d}:{seconds:02d}.{hundredths}"
@@ -0,0 +1,132 @@
+"""Module for running blocking work on a shared pool of worker threads."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from enum import IntEnum
+from itertools import count
+from threading import Condition, Thread
+import heapq
+import traceback
+
+# Custom Imports
+from .completions import CompletionQueue
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# worker threads, the work is mostly waiting on the api
+WORKERS = 3
+
+
+# =============================================================================
+# >> EXECUTOR CLASS
+# =============================================================================
+class Executor:
+    """Singleton Executor class.
+    Tasks run on a few worker threads, highest priority first.
+    Every priority has a queue limit, submit returns False when it's full."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if Executor.__instance is None:
+            Executor()
+        return Executor.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if Executor.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        # [(priority, order, function, args, callback)]
+        self._queue = []
+        self._order = count()
+        self._condition = Condition()
+        self._running = True
+        # {priority: queued tasks}
+        self.queued = {priority: 0 for priority in Priority}
+        # {priority: tasks refused because the queue was full}
+        self.rejected = {priority: 0 for priority in Priority}
+
+        self._workers = [
+            Thread(target=self._work, name=f"jtimer-worker-{i}", daemon=True)
+            for i in range(WORKERS)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        Executor.__instance = self
+
+    def submit(self, priority, function, *args, callback=None):
+        """Queue function(*args) to run on a worker thread,
+        callback(result) is then called on the main thread.
+        Returns False if the queue of that priority is full."""
+        with self._condition:
+            if not self._running or self.queued[priority] >= QUEUE_LIMITS[priority]:
+                self.rejected[priority] += 1
+                return False
+
+            self.queued[priority] += 1
+            heapq.heappush(
+                self._queue, (priority, next(self._order), function, args, callback)
+            )
+            self._condition.notify()
+        return True
+
+    def shutdown(self):
+        """Stop workers after the tasks they're running,
+        queued tasks are dropped."""
+        with self._condition:
+            self._running = False
+            self._queue.clear()
+            self._condition.notify_all()
+        Executor.__instance = None
+
+    def _work(self):
+        """Worker thread loop."""
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                priority, order, function, args, callback = heapq.heappop(
+                    self._queue
+                )
+                self.queued[priority] -= 1
+
+            try:
+                result = function(*args)
+                if callback is not None:
+                    CompletionQueue.instance().post(callback, result)
+            except Exception:
+                print(f"[jtimer] Exception in {priority.name} task:")
+                traceback.print_exc()
+
+
+# =============================================================================
+# >> ENUMS
+# =============================================================================
+class Priority(IntEnum):
+    """Enum for task priorities, lower runs first."""
+
+    UPLOAD = 0
+    JOIN = 1
+    MENU = 2
+    BACKGROUND = 3
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# max queued tasks per priority
+QUEUE_LIMITS = {
+    Priority.UPLOAD: 256,
+    Priority.JOIN: 64,
+    Priority.MENU: 8,
+    Priority.BACKGROUND: 16,
+}
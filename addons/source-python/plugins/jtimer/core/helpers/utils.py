@@ -41,17 +41,7 @@ def return_spectators(player_index, format_type="name"):
         spec_list.append(player.name)
 
     if format_type == "name":
-        if not spec_list:
-            return "None"
-
-        if len(spec_list) == 1:
-            return spec_list[0]
-
-        if len(spec_list) == 2:
-            return f"{spec_list[0]} & {spec_list[1]}"
-
-        last = spec_list.pop()
-        return ", ".join(str(spectator) for spectator in spec_list) + " & " + last
+        return _join_names(spec_list)
 
     if format_type == "count":
         return str(len(spec_list))
@@ -61,6 +51,20 @@ def return_spectators(player_index, format_type="name"):
     return spec_list
 
 
+def _join_names(names):
+    """Join names as "a, b & c"."""
+    if not names:
+        return "None"
+
+    if len(names) == 1:
+        return names[0]
+
+    if len(names) == 2:
+        return f"{names[0]} & {names[1]}"
+
+    return ", ".join(str(name) for name in names[:-1]) + " & " + names[-1]
+
+
 def get_players():
     """Get a list of currently connected players."""
     players = []
@@ -100,3 +104,63 @@ def get_country(ip):
         name = match["country"]["names"]["en"]
 
     return (name, code)
+
+
+# =============================================================================
+# >> SPECTATOR GRAPH CLASS
+# =============================================================================
+class SpectatorGraph:
+    """Which player every spectator is watching.
+    Updated from per-tick player snapshots, spectator lists
+    are only rebuilt when someone starts, stops or switches spectating."""
+
+    def __init__(self):
+        """Create a new empty SpectatorGraph."""
+        # {observer index: target index}
+        self.targets = {}
+        # {target index: [observer indexes]}
+        self.indexes = {}
+        # {target index: "a, b & c"}
+        self.names = {}
+
+    def update(self, snapshot, players):
+        """Update edges from {index: PlayerSnapshot},
+        players is {index: Player} for looking up names."""
+        targets = {}
+        for index, player_snapshot in snapshot.items():
+            target = player_snapshot.observer_target
+            if (
+                player_snapshot.is_observer()
+                and target is not None
+                and target != index
+            ):
+                targets[index] = target
+
+        if targets == self.targets:
+            return
+
+        self.targets = targets
+        self.indexes = {}
+        for observer in sorted(targets):
+            self.indexes.setdefault(targets[observer], []).append(observer)
+
+        self.names = {
+            target: _join_names(
+                [players[i].name for i in observers if i in players]
+            )
+            for target, observers in self.indexes.items()
+        }
+
+    def spectator_indexes(self, index):
+        """Indexes of players spectating a player."""
+        return self.indexes.get(index, [])
+
+    def spectator_names(self, index):
+        """Names of players spectating a player, or "None"."""
+        return self.names.get(index, "None")
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+spectator_graph = SpectatorGraph()
@@ -5,8 +5,8 @@
 # =============================================================================
 # Python Imports
 import os
-from threading import Thread
 import re
+import time
 
 # Source.Python Imports
 from listeners import (
@@ -15,6 +15,7 @@ from listeners import (
     OnClientDisconnect,
     OnLevelInit,
     OnLevelEnd,
+    OnEntityOutput,
 )
 from events import Event
 from events.hooks import PreEvent, EventAction
@@ -31,7 +32,12 @@ from filters.recipients import RecipientFilter
 
 # Custom Imports
 from .timer.timer import Timer
-from .helpers.utils import is_player, get_players
+from .timer.scheduler import Scheduler
+from .timer.load import LoadController
+from .hud import hud
+from .helpers.utils import is_player
+from .helpers.executor import Executor, Priority
+from .helpers.completions import CompletionQueue
 from .helpers.converts import (
     userid_to_player,
     steamid_to_player,
@@ -39,7 +45,7 @@ from .helpers.converts import (
     index_to_source_player,
 )
 from .players.player import Player
-from .map.map import Map
+from .map.loader import MapLoader
 from .players.state import PlayerClass
 from .commands.clientcommands import CommandHandler
 from .chat.messages import message_hidechat_send
@@ -110,35 +116,45 @@ engine_sound.precache_sound("vo/null.wav")
 def on_level_init(level):
     """Called when a new map is loaded."""
     Timer.instance().clear()
-    Map.get_map()
-    for player in get_players():
-        Player.add_player(player.playerinfo, player.index)
+    hud.forget_all()
+    MapLoader.instance().load(server.map_name)
 
 
 @OnLevelEnd
 def on_level_end():
     """Called when a map is unloaded."""
+    MapLoader.instance().cancel()
     Timer.instance().clear()
 
 
 @OnTick
 def on_tick():
     """Called every engine tick."""
+    start = time.perf_counter()
+    CompletionQueue.instance().drain()
     Timer.instance().update_timers()
-    if server.tick % 67 == 0:
-        if Timer.instance().current_map:
-            Timer.instance().current_map.start_zone.draw()
-            Timer.instance().current_map.end_zone.draw()
-            for checkpoint in Timer.instance().current_map.checkpoints:
-                checkpoint.draw()
+    Scheduler.instance().run()
+    LoadController.instance().update(time.perf_counter() - start)
+
+
+@OnEntityOutput
+def on_entity_output(output_name, activator, caller, value, delay):
+    """Called when an entity fires an output."""
+    current_map = Timer.instance().current_map
+    if current_map and current_map.zone_triggers:
+        current_map.zone_triggers.on_output(output_name, activator, caller)
 
 
 @OnClientActive
 def on_client_active(index):
     """Called when a client has fully joined the game."""
+    hud.forget(index)
     playerinfo = playerinfo_from_index(index)
     if is_player(playerinfo):
-        Thread(target=Player.add_player, args=(playerinfo, index)).start()
+        if not Executor.instance().submit(
+            Priority.JOIN, Player.add_player, playerinfo, index
+        ):
+            print(f"[jtimer] Join queue is full, couldn't add {playerinfo.name}.")
     else:
         return
 
@@ -146,6 +162,11 @@ def on_client_active(index):
 @OnClientDisconnect
 def on_client_disconnect(index):
     """Called when a client leaves the game."""
+    current_map = Timer.instance().current_map
+    if current_map and current_map.zone_triggers:
+        current_map.zone_triggers.remove_player(index)
+    hud.forget(index)
+
     playerinfo = playerinfo_from_index(index)
     if is_player(playerinfo):
         Timer.instance().remove_player(SteamID.parse(playerinfo.steamid).to_steamid2())
@@ -153,6 +174,35 @@ def on_client_disconnect(index):
         return
 
 
+# =============================================================================
+# >> SCHEDULED JOBS
+# =============================================================================
+def _drawn_zones():
+    """Zones drawn on the current map."""
+    current_map = Timer.instance().current_map
+    if not current_map:
+        return ()
+    return [current_map.start_zone, current_map.end_zone] + current_map.checkpoints
+
+
+@Scheduler.instance().job(
+    "hud", 0.5, items=lambda: Timer.instance().players, key=lambda p: p.index
+)
+def draw_hud(player):
+    """Update player hud every half a second."""
+    if not MapLoader.instance().ready:
+        return
+    snapshot = Timer.instance().snapshot.get(player.index)
+    if snapshot is not None:
+        hud.draw(player, Timer.instance().current_map, snapshot)
+
+
+@Scheduler.instance().job("zones", 1.0, items=_drawn_zones)
+def draw_zone(zone):
+    """Redraw zone beams before they fade out."""
+    zone.draw()
+
+
 # =============================================================================
 # >> PRE-EVENTS
 # =============================================================================
@@ -3,69 +3,75 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python Imports
+import time
+
 # Source.Python Imports
 from messages import HintText, KeyHintText
 from engines.server import server
-from players.entity import Player
-from players.helpers import index_from_userid
 
 # Custom Imports
 from ..helpers.converts import ticks_to_timestamp
 from ..players import state
-from ..helpers.utils import return_spectators
+from ..helpers.utils import spectator_graph
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
 buffer_white_space = "\n\n\n\n\n\n"
 
+# seconds after which unchanged hud text is sent again so it doesn't fade
+RESEND_INTERVAL = 2.0
+
+# {(message class, recipient index): (text, time.monotonic() sent)}
+_sent = {}
+hud_stats = {"sent": 0, "skipped": 0}
+
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
-def draw(player, current_map):
-    """Draw hud to player."""
-    current_player = index_from_userid(player.userid)
-    if Player(current_player).is_observer():
+def draw(player, current_map, snapshot):
+    """Draw hud to player, snapshot is the player's PlayerSnapshot."""
+    if snapshot.is_observer():
         # Hud will be drawn by other player
         pass
     else:
-        spec_indexes = return_spectators(current_player, "index")
+        current_player = snapshot.index
+        spec_indexes = spectator_graph.spectator_indexes(current_player)
         _draw_timer(player, current_map, spec_indexes)
-        _draw_right_hud(player, current_map, spec_indexes)
+        _draw_right_hud(player, current_map, spec_indexes, current_player)
 
 
-def _draw_right_hud(player, current_map, spec_indexes):
+def _draw_right_hud(player, current_map, spec_indexes, current_player):
     """Draw right side hud to player."""
-    current_player = index_from_userid(player.userid)
-    spectators = "Spectators: " + return_spectators(current_player)
+    spectators = "Spectators: " + spectator_graph.spectator_names(current_player)
 
-    if Player(current_player).is_observer():
-        # Display hud of other player?
-        pass
+    if player.state.player_class == state.PlayerClass.SOLDIER:
+        current_class = "soldier"
+    elif player.state.player_class == state.PlayerClass.DEMOMAN:
+        current_class = "demoman"
     else:
-        if player.state.player_class == state.PlayerClass.SOLDIER:
-            current_class = "soldier"
-        elif player.state.player_class == state.PlayerClass.DEMOMAN:
-            current_class = "demoman"
-        else:
-            return
-
-        if current_map.records[current_class] is not None:
-            wr = (
-                "World Record:\n"
-                + current_map.records[current_class]["player"]["name"]
-                + " - "
-                + str(
-                    ticks_to_timestamp(current_map.records[current_class]["time"])
-                    + "\n"
-                )
+        return
+
+    if current_map.records[current_class] is not None:
+        wr = (
+            "World Record:\n"
+            + current_map.records[current_class]["player"]["name"]
+            + " - "
+            + str(
+                ticks_to_timestamp(current_map.records[current_class]["time"])
+                + "\n"
             )
-        else:
-            wr = "World Record:\nNone\n"
+        )
+    else:
+        wr = "World Record:\nNone\n"
 
-        right_hint = KeyHintText(wr + "\n" + spectators + buffer_white_space)
-        right_hint.send(current_player, spec_indexes)
+    _send(
+        KeyHintText,
+        wr + "\n" + spectators + buffer_white_space,
+        [current_player] + spec_indexes,
+    )
 
 
 def _draw_timer(player, current_map, spec_indexes):
@@ -81,8 +87,7 @@ def _draw_timer(player, current_map, spec_indexes):
         return
 
     if player.state.timer_mode == state.TimerMode.NONE:
-        hint_text = HintText("Timer Disabled")
-        hint_text.send(index_from_userid(player.userid))
+        _send(HintText, "Timer Disabled", [player.index])
         return
 
     if player.state.timer_mode == state.TimerMode.MAP:
@@ -145,17 +150,11 @@ def _draw_timer(player, current_map, spec_indexes):
 
             split_line = ticks_to_timestamp(last_cp[1] - player.state.map[1])
 
-            if current_map.records[class_string] is not None:
-                for record_checkpoint in current_map.records[class_string][
-                    "checkpoints"
-                ]:
-                    if record_checkpoint["cp_index"] == last_cp[0].index:
-                        split_time = (
-                            last_cp[1] - player.state.map[1] - record_checkpoint["time"]
-                        )
-                        split_sign = "+" if split_time > 0 else "-"
-                        split_line = f"WR{split_sign}{ticks_to_timestamp(split_time)}"
-                        break
+            wr_split = current_map.wr_split(class_string, last_cp[0].index)
+            if wr_split is not None:
+                split_time = last_cp[1] - player.state.map[1] - wr_split
+                split_sign = "+" if split_time > 0 else "-"
+                split_line = f"WR{split_sign}{ticks_to_timestamp(split_time)}"
 
             cp_line = " (cp" + str(last_cp[0].index) + ": "
             cp_line += split_line
@@ -180,7 +179,35 @@ def _draw_timer(player, current_map, spec_indexes):
 
     combined += mode_line
 
-    hint_text = HintText(combined)
-
     # draw
-    hint_text.send(index_from_userid(player.userid), spec_indexes)
+    _send(HintText, combined, [player.index] + spec_indexes)
+
+
+def _send(message_class, text, indexes):
+    """Send hud text to recipients that don't already show it."""
+    now = time.monotonic()
+    resend_time = now - RESEND_INTERVAL
+
+    recipients = []
+    for index in indexes:
+        last = _sent.get((message_class, index))
+        if last is None or last[0] != text or last[1] <= resend_time:
+            _sent[(message_class, index)] = (text, now)
+            recipients.append(index)
+
+    hud_stats["sent"] += len(recipients)
+    hud_stats["skipped"] += len(indexes) - len(recipients)
+
+    if recipients:
+        message_class(text).send(*recipients)
+
+
+def forget(index):
+    """Forget hud text sent to a recipient, call when they join or leave."""
+    _sent.pop((HintText, index), None)
+    _sent.pop((KeyHintText, index), None)
+
+
+def forget_all():
+    """Forget all hud text sent, call on map change."""
+    _sent.clear()
@@ -4,8 +4,7 @@
 # >> IMPORTS
 # =============================================================================
 # Python Imports
-from threading import Thread
-from collections.abc import Iterable
+from functools import partial
 
 # Source.Python Imports
 from menus.radio import PagedRadioMenu, PagedRadioOption
@@ -13,8 +12,10 @@ from menus.radio import PagedRadioMenu, PagedRadioOption
 # Custom Imports
 from ..api.times import map_times
 from ..api.maps import map_info_name
-from ..helpers.converts import ticks_to_timestamp
-from ..chat.messages import message_no_match
+from ..helpers.converts import ticks_to_timestamp, ticks_to_timestamps
+from ..chat.messages import message_no_match, message_busy
+from ..helpers.executor import Executor, Priority
+from ..timer.load import LoadController
 
 # =============================================================================
 # >> GLOBAL VARIABLES
@@ -65,33 +66,39 @@ _cached_map_menus = []
 # =============================================================================
 def show_map_menu(map_name, player_index):
     """Show /top <map> radio menu to player."""
-    thread = _ThreadWithCallback(
-        target=_map_top_parent_menu,
-        args=(map_name, player_index),
-        callback=_show_map_menu_callback,
-    )
-    thread.start()
+    LoadController.instance().run_or_defer(_submit_map_menu, map_name, player_index)
+
+
+def _submit_map_menu(map_name, player_index):
+    """Get map info on a worker thread for /top <map> menu."""
+    if not Executor.instance().submit(
+        Priority.MENU,
+        map_info_name,
+        map_name,
+        callback=partial(_show_map_menu_callback, player_index=player_index),
+    ):
+        message_busy.send(player_index)
 
 
 def _show_map_menu_callback(result, player_index):
     """Callback for showing /top <map> menu."""
-    if result is False:
+    map_info, r = result
+    if map_info is None:
         message_no_match.send(player_index)
+        return
 
+    _map_top_parent_menu(map_info, player_index)
 
-def _map_top_parent_menu(map_name, player_index):
-    """Construct PagedRadioMenu with map, course and bonus times."""
-    map_info, r = map_info_name(map_name)
-    if map_info is None:
-        return False, player_index
 
+def _map_top_parent_menu(map_info, player_index):
+    """Construct PagedRadioMenu with map, course and bonus times."""
     global _cached_map_menus
     for cached_menu in _cached_map_menus:
         if cached_menu["map_id"] == map_info["id"]:
             cached_menu["menu"].send(player_index)
             if player_index not in cached_menu["opened_by"]:
                 cached_menu["opened_by"].append(player_index)
-            return True, player_index
+            return
 
     data = [PagedRadioOption("Map", value=map_info)]
     menu = PagedRadioMenu(
@@ -115,13 +122,34 @@ def _map_top_parent_menu(map_name, player_index):
     )
     menu.send(player_index)
 
-    return True, player_index
-
 
 def _map_parent_select(menu, player_index, selected_option):
     """Callback for selecting value in /top <map> menu."""
-    map_info = selected_option.value
+    LoadController.instance().run_or_defer(
+        _load_map_top, menu, player_index, selected_option.value
+    )
 
+
+def _load_map_top(menu, player_index, map_info):
+    """Get map times on a worker thread unless the menu is cached."""
+    for cached_menu in _cached_map_menus:
+        if cached_menu["map_id"] == map_info["id"] and cached_menu["map_top"]:
+            _send_map_top(None, menu, player_index, map_info)
+            return
+
+    if not Executor.instance().submit(
+        Priority.MENU,
+        map_times,
+        map_info["id"],
+        callback=partial(
+            _send_map_top, menu=menu, player_index=player_index, map_info=map_info
+        ),
+    ):
+        message_busy.send(player_index)
+
+
+def _send_map_top(times, menu, player_index, map_info):
+    """Build /top <map> times menu if needed and send it to player."""
     global _cached_map_menus
 
     for cached_menu in _cached_map_menus:
@@ -133,7 +161,7 @@ def _map_parent_select(menu, player_index, selected_option):
 
             if map_top is None:
                 top_menu, soldier_times, demoman_times = _map_top_menu(
-                    map_info["id"], map_info["name"]
+                    map_info["id"], map_info["name"], times
                 )
                 map_top = {"menu": top_menu, "map_times": []}
 
@@ -167,38 +195,34 @@ def _map_parent_close(menu, player_index):
                 _cached_map_menus.append(new_cache)
 
 
-def _map_top_menu(map_id, map_name):
+def _map_top_menu(map_id, map_name, times):
     """Construct PagedRadioMenu with top 50 times for map."""
-    times = map_times(map_id)
     if times is None:
         times = {"soldier": [], "demoman": []}
 
     soldier_options = []
     demoman_options = []
 
-    for soldier_time in times["soldier"]:
-        timestamp = ticks_to_timestamp(soldier_time["time"])
-        split = ticks_to_timestamp(soldier_time["time"] - times["soldier"][0]["time"])
-        rank = soldier_time["rank"]
-        name = soldier_time["player"]["name"]
-
-        text = f"[#{rank}] {timestamp} +{split} :: {name}"
+    for class_times, options, class_id in (
+        (times["soldier"], soldier_options, 2),
+        (times["demoman"], demoman_options, 4),
+    ):
+        if not class_times:
+            continue
 
-        soldier_options.append(
-            PagedRadioOption(text, value=(map_id, map_name, 2, rank))
-        )
+        first = class_times[0]["time"]
+        timestamps = ticks_to_timestamps([t["time"] for t in class_times])
+        splits = ticks_to_timestamps([t["time"] - first for t in class_times])
 
-    for demoman_time in times["demoman"]:
-        timestamp = ticks_to_timestamp(demoman_time["time"])
-        split = ticks_to_timestamp(demoman_time["time"] - times["demoman"][0]["time"])
-        rank = demoman_time["rank"]
-        name = demoman_time["player"]["name"]
+        for class_time, timestamp, split in zip(class_times, timestamps, splits):
+            rank = class_time["rank"]
+            name = class_time["player"]["name"]
 
-        text = f"[#{rank}] {timestamp} +{split} :: {name}"
+            text = f"[#{rank}] {timestamp} +{split} :: {name}"
 
-        demoman_options.append(
-            PagedRadioOption(text, value=(map_id, map_name, 4, rank))
-        )
+            options.append(
+                PagedRadioOption(text, value=(map_id, map_name, class_id, rank))
+            )
 
     menu = PagedRadioMenu(
         data=soldier_options,
@@ -297,31 +321,6 @@ def _map_time_close(menu, player_index):
                     _cached_map_menus.append(new_cache)
 
 
-class _ThreadWithCallback(Thread):
-    """Class for creating threads with callbacks."""
-
-    def __init__(self, target, args, callback=None):
-        """Create thread with callback."""
-        Thread.__init__(self)
-        self.target = target
-        self.args = args
-        self.callback = callback
-
-    def run(self):
-        """Start thread execution."""
-        result = None
-        if isinstance(self.args, Iterable):
-            result = self.target(*self.args)
-        else:
-            result = self.target(self.args)
-
-        if self.callback is not None:
-            if isinstance(result, Iterable):
-                self.callback(*result)
-            else:
-                self.callback(result)
-
-
 # =============================================================================
 # >> ALL DECLARATION
 # =============================================================================
@@ -53,7 +53,8 @@ class Bonus(Segment):
             start_time = float(server.tick - 1 + subtick)
 
             player.state.bonus_state = RunState.RUN
-            player.state.bonus = (self, start_time)
+            player.state.bonus[0] = self
+            player.state.bonus[1] = start_time
 
     def on_enter_end(self, player):
         """Called when entering the bonus end zone."""
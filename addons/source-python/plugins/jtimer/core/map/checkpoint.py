@@ -14,6 +14,8 @@ from ..zones.zone import Zone
 # >> CHECKPOINT CLASS
 # =============================================================================
 class Checkpoint(Zone):
+    __slots__ = ("index",)
+
     def __init__(
         self, index, p1=mathlib.NULL_VECTOR, p2=mathlib.NULL_VECTOR, orientation=0
     ):
@@ -48,7 +48,7 @@ class Course(Segment):
                 # TODO:
                 # print message to player
                 player.state.reset()
-                player.timer_mode = TimerMode.NONE
+                player.state.timer_mode = TimerMode.NONE
 
     def on_leave_start(self, player):
         """Called when leaving the course start zone."""
@@ -0,0 +1,244 @@
+"""Module for loading maps without blocking the game thread."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+import threading
+import time
+import traceback
+
+# Custom Imports
+from .map import Map
+from ..timer.timer import Timer
+from ..players.player import Player
+from ..helpers.utils import get_players
+from ..helpers.converts import userid_to_source_player
+from ..helpers.executor import Executor, Priority
+from ..helpers.completions import CompletionQueue
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# pipeline stages in order, timed separately
+STAGES = ("map info", "zones", "build", "players")
+
+# fetches before giving up and running the map without zones
+MAX_ATTEMPTS = 4
+
+# seconds before retrying a failed fetch, doubled every attempt
+RETRY_DELAY = 2
+
+
+# =============================================================================
+# >> MAP LOADER CLASS
+# =============================================================================
+class MapLoader:
+    """Singleton MapLoader class.
+    Map info and zones are fetched on a worker thread, zones are built on the
+    main thread once they arrive, then connected players are registered.
+    Timers aren't started until the map is ready.
+    Results of a load that was cancelled or replaced by a newer one are dropped."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if MapLoader.__instance is None:
+            MapLoader()
+        return MapLoader.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if MapLoader.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        # incremented on every load and cancel, stale results are dropped
+        self.generation = 0
+        self.map_name = None
+        # stage that's running or None when idle
+        self.stage = None
+        # {stage: seconds} of the current or last load
+        self.timings = {}
+        self.started = 0.0
+        # fetches tried for the current load
+        self.attempts = 0
+        self._retry_timer = None
+        MapLoader.__instance = self
+
+    def load(self, map_name):
+        """Start loading a map, returns immediately."""
+        self.cancel()
+        self.map_name = map_name
+        self.stage = "map info"
+        self.timings = {}
+        self.started = time.perf_counter()
+        self.attempts = 0
+        self._submit_fetch(self.generation)
+
+    def cancel(self):
+        """Drop the results of the running load."""
+        self.generation += 1
+        self.stage = None
+        if self._retry_timer is not None:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+
+    def _submit_fetch(self, generation):
+        """Queue fetching map info and zones."""
+        if generation != self.generation:
+            return
+
+        self._retry_timer = None
+        self.attempts += 1
+        if not Executor.instance().submit(
+            Priority.JOIN,
+            self._fetch,
+            generation,
+            self.map_name,
+            callback=self._build,
+        ):
+            print(f"[jtimer] Join queue is full, couldn't load '{self.map_name}'.")
+            self._retry(generation)
+
+    def _retry(self, generation):
+        """Fetch again later, or go on without zones after MAX_ATTEMPTS."""
+        if self.attempts >= MAX_ATTEMPTS:
+            print(f"[jtimer] Giving up loading zones for '{self.map_name}'.")
+            self._submit_players(generation)
+            return
+
+        delay = RETRY_DELAY * 2 ** (self.attempts - 1)
+        print(f"[jtimer] Retrying to load '{self.map_name}' in {delay}s.")
+        # the fetch is queued from the main thread like the first one
+        self._retry_timer = threading.Timer(
+            delay, CompletionQueue.instance().post, (self._submit_fetch, generation)
+        )
+        self._retry_timer.daemon = True
+        self._retry_timer.start()
+
+    def _fetch(self, generation, map_name):
+        """Fetch map info and zones, runs on a worker thread.
+        Returns (generation, map info, zones, {stage: seconds}, failed),
+        failed is True if it's worth trying again."""
+        timings = {}
+
+        try:
+            start = time.perf_counter()
+            map_info, r = Map.fetch_info(map_name)
+            timings["map info"] = time.perf_counter() - start
+
+            if map_info is None:
+                return generation, None, None, timings, _unavailable(r)
+            if generation != self.generation:
+                return generation, map_info, None, timings, False
+
+            start = time.perf_counter()
+            zones, r = Map.fetch_zones(map_info)
+            timings["zones"] = time.perf_counter() - start
+
+            if zones is None and _unavailable(r):
+                return generation, map_info, None, timings, True
+
+        except Exception:
+            print(f"[jtimer] Exception while loading '{map_name}':")
+            traceback.print_exc()
+            return generation, None, None, timings, True
+
+        return generation, map_info, zones, timings, False
+
+    def _build(self, result):
+        """Build zones and make the map current, runs on the main thread."""
+        generation, map_info, zones, timings, failed = result
+        if generation != self.generation:
+            return
+
+        self.timings.update(timings)
+
+        if failed:
+            self._retry(generation)
+            return
+
+        if zones is not None:
+            self.stage = "build"
+            start = time.perf_counter()
+            Timer.instance().current_map = Map.from_api(map_info, zones)
+            self.timings["build"] = time.perf_counter() - start
+            self._restart_players()
+
+        # players are registered even without zones, like on an unzoned map
+        self._submit_players(generation)
+
+    def _restart_players(self):
+        """Start players that joined while zones were loading,
+        their timer was disabled because the map wasn't zoned yet."""
+        for player in Timer.instance().players:
+            source_player = userid_to_source_player(player.userid)
+            if source_player is not None and not source_player.playerinfo.is_dead():
+                player.start()
+
+    def _submit_players(self, generation):
+        """Queue adding connected players that aren't added yet."""
+        self.stage = "players"
+        timer = Timer.instance()
+        players = [
+            (player.playerinfo, player.index)
+            for player in get_players()
+            if timer.player_by_index(player.index) is None
+        ]
+        if not Executor.instance().submit(
+            Priority.JOIN,
+            self._register,
+            generation,
+            players,
+            callback=self._finish,
+        ):
+            print("[jtimer] Join queue is full, couldn't add connected players.")
+            self._finish((generation, 0.0))
+
+    def _register(self, generation, players):
+        """Add connected players, runs on a worker thread.
+        Returns (generation, seconds)."""
+        start = time.perf_counter()
+        for playerinfo, index in players:
+            if generation != self.generation:
+                break
+            # joined on their own since the stage was queued
+            if Timer.instance().player_by_userid(playerinfo.userid) is not None:
+                continue
+            try:
+                Player.add_player(playerinfo, index)
+            except Exception:
+                print(f"[jtimer] Exception while adding {playerinfo.name}:")
+                traceback.print_exc()
+        return generation, time.perf_counter() - start
+
+    def _finish(self, result):
+        """Record the players stage and print the load timings."""
+        generation, seconds = result
+        if generation != self.generation:
+            return
+
+        self.timings["players"] = seconds
+        self.stage = None
+        total = time.perf_counter() - self.started
+        stages = ", ".join(
+            f"{stage}: {self.timings[stage] * 1000:.1f}ms"
+            for stage in STAGES
+            if stage in self.timings
+        )
+        print(f"[jtimer] Loaded '{self.map_name}' in {total * 1000:.1f}ms ({stages})")
+
+    @property
+    def ready(self):
+        """True once the current map's zones are built."""
+        return Timer.instance().current_map is not None
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _unavailable(response):
+    """Returns True if the api couldn't answer, as opposed to
+    answering that there's no such map or zones."""
+    return response is None or response.status_code >= 500
@@ -4,7 +4,7 @@
 # >> IMPORTS
 # =============================================================================
 # Python Imports
-from threading import Thread
+from functools import partial
 from engines.server import server
 
 # Source.Python Imports
@@ -13,7 +13,13 @@ from mathlib import Vector
 # Custom Imports
 from .segment import Segment
 from .checkpoint import Checkpoint
+from .zonetable import ZoneTable
+from .splits import build_split_tables
 from ..zones.zone import Zone
+from ..zones.grid import ZoneGrid
+from ..zones.batch import ZoneArrays
+from ..zones.triggers import ZoneTriggers
+from ..config import API_CFG, TIMER_CFG
 from ..players.state import RunState, PlayerClass, TimerMode
 from ..chat.messages import (
     message_map_record_set,
@@ -27,10 +33,10 @@ from ..chat.messages import (
     message_points_gain,
 )
 from ..helpers.converts import ticks_to_timestamp
-from ..api.times import add_map_time
-from ..api.maps import map_info_name
+from ..api.journal import UploadJournal
+from ..api.maps import map_info_name, forget_map_info
 from ..api.zones import map_zones
-from ..timer import timer
+from ..api.times import forget_map_times
 
 
 # =============================================================================
@@ -49,64 +55,108 @@ class Map(Segment):
         self.courses = []
         self.bonuses = []
         self.records = records
+        self.zone_table = ZoneTable(self)
+        self.zone_grid = ZoneGrid()
+        self.zone_arrays = None
+        self.zone_triggers = None
+
+    @property
+    def records(self):
+        """World records per class."""
+        return self._records
+
+    @records.setter
+    def records(self, records):
+        """Set records and rebuild WR split tables."""
+        self._records = records
+        self.splits = build_split_tables(records)
+
+    def wr_split(self, class_string, cp_index):
+        """Return WR time at a checkpoint relative to start, or None."""
+        table = self.splits.get(class_string)
+        if table is None:
+            return None
+        return table.get(cp_index)
 
     @staticmethod
-    def get_map():
-        """Get the current map from the api."""
-
-        # check if current map exists in api
-        print(f"[jtimer] Getting map info for '{server.map_name}'")
-        map_info, response = map_info_name(server.map_name)
+    def fetch_info(map_name):
+        """Get map info from the api, blocking.
+        Returns (map info or None, response)."""
+        print(f"[jtimer] Getting map info for '{map_name}'")
+        map_info, response = map_info_name(map_name)
 
         if map_info is None:
-            print(f"[jtimer] Couldn't get map info for '{server.map_name}'.")
-            if response.status_code < 500:
-                print(f"api response: {response.status_code}\n{response.json()}")
-            else:
-                print(f"api response: {response.status_code}")
-
-        else:
-            print(f"[jtimer] Loaded map info for '{server.map_name}'!")
-            map_ = Map(
-                map_info["id"],
-                map_info["name"],
-                map_info["tiers"]["soldier"],
-                map_info["tiers"]["demoman"],
-                map_info["records"],
-            )
+            print(f"[jtimer] Couldn't get map info for '{map_name}'.")
+            _print_response(response)
+            return None, response
 
-            zones, response = map_zones(map_info["id"])
+        print(f"[jtimer] Loaded map info for '{map_name}'!")
+        return map_info, response
 
-            if zones is None:
-                print(f"[jtimer] Couldn't get map zones for '{server.map_name}'.")
-                if response.status_code < 500:
-                    print(f"api response: {response.status_code}\n{response.json()}")
-                else:
-                    print(f"api response: {response.status_code}")
-
-            else:
-                for z in zones:
-                    if z["zone_type"] == "start":
-                        p1 = Vector(z["p1"][0], z["p1"][1], z["p1"][2])
-                        p2 = Vector(z["p2"][0], z["p2"][1], z["p2"][2])
-                        map_.add_start_zone(Zone(p1, p2, z["orientation"]))
-
-                    elif z["zone_type"] == "end":
-                        p1 = Vector(z["p1"][0], z["p1"][1], z["p1"][2])
-                        p2 = Vector(z["p2"][0], z["p2"][1], z["p2"][2])
-                        map_.add_end_zone(Zone(p1, p2))
-
-                    elif z["zone_type"] == "cp":
-                        p1 = Vector(
-                            z["zone"]["p1"][0], z["zone"]["p1"][1], z["zone"]["p1"][2]
-                        )
-                        p2 = Vector(
-                            z["zone"]["p2"][0], z["zone"]["p2"][1], z["zone"]["p2"][2]
-                        )
-                        map_.add_checkpoint(Checkpoint(z["cp_index"], p1, p2))
-
-                print(f"[jtimer] Loaded zones for '{server.map_name}'!")
-                timer.Timer.instance().current_map = map_
+    @staticmethod
+    def fetch_zones(map_info):
+        """Get map zones from the api, blocking.
+        Returns (zones or None, response)."""
+        zones, response = map_zones(map_info["id"])
+
+        if zones is None:
+            print(f"[jtimer] Couldn't get map zones for '{map_info['name']}'.")
+            _print_response(response)
+            return None, response
+
+        return zones, response
+
+    @staticmethod
+    def from_api(map_info, zones):
+        """Create a map with zones from api data."""
+        map_ = Map(
+            map_info["id"],
+            map_info["name"],
+            map_info["tiers"]["soldier"],
+            map_info["tiers"]["demoman"],
+            map_info["records"],
+        )
+
+        for z in zones:
+            if z["zone_type"] == "start":
+                p1 = Vector(z["p1"][0], z["p1"][1], z["p1"][2])
+                p2 = Vector(z["p2"][0], z["p2"][1], z["p2"][2])
+                map_.add_start_zone(Zone(p1, p2, z["orientation"]))
+
+            elif z["zone_type"] == "end":
+                p1 = Vector(z["p1"][0], z["p1"][1], z["p1"][2])
+                p2 = Vector(z["p2"][0], z["p2"][1], z["p2"][2])
+                map_.add_end_zone(Zone(p1, p2))
+
+            elif z["zone_type"] == "cp":
+                p1 = Vector(z["zone"]["p1"][0], z["zone"]["p1"][1], z["zone"]["p1"][2])
+                p2 = Vector(z["zone"]["p2"][0], z["zone"]["p2"][1], z["zone"]["p2"][2])
+                map_.add_checkpoint(Checkpoint(z["cp_index"], p1, p2))
+
+        map_.compile_zones()
+        print(f"[jtimer] Loaded zones for '{map_info['name']}'!")
+        return map_
+
+    def compile_zones(self):
+        """Compile the zone table and spatial index for all zones
+        of the map, courses and bonuses.
+        Call this again after changing zones."""
+        self.zone_table = ZoneTable(self)
+        self.zone_grid = ZoneGrid()
+
+        for zone in self.zone_table.zones:
+            zone.clear_expanded()
+            self.zone_grid.add(zone)
+
+        if ZoneArrays is not None:
+            self.zone_arrays = ZoneArrays(self.zone_grid.zones)
+
+        if self.zone_triggers is not None:
+            self.zone_triggers.remove()
+            self.zone_triggers = None
+
+        if TIMER_CFG["zone_backend"] == "triggers":
+            self.zone_triggers = ZoneTriggers(self.zone_grid.zones)
 
     def on_enter_start(self, player):
         """Called when entering the map start zone."""
@@ -177,8 +227,14 @@ class Map(Segment):
             player.state.map[2] = end_time
             player.state.map_state = RunState.END
 
-            thread = MapTimeUploader(self.id_, player, self.upload_map_time_callback)
-            thread.start()
+            if API_CFG["authenticate"]:
+                # read the run now, the state is reused as soon as the player restarts
+                UploadJournal.instance().add(
+                    self.id_,
+                    player.id_,
+                    *map_time_args(player),
+                    callback=partial(self.upload_map_time_callback, player=player),
+                )
 
     def upload_map_time_callback(self, result, player):
         """Callback for uploading map times."""
@@ -186,6 +242,10 @@ class Map(Segment):
         if result is None:
             return
 
+        # records and leaderboard changed, don't serve them from the cache
+        forget_map_info(self.id_, self.name)
+        forget_map_times(self.id_)
+
         class_string = None
         if player.state.player_class == PlayerClass.SOLDIER:
             class_string = "soldier"
@@ -292,20 +352,19 @@ class Map(Segment):
 
             relative_enter_time = enter_time - player.state.map[1]
 
-            if self.records[class_string] is not None:
-                for record_checkpoint in self.records[class_string]["checkpoints"]:
-                    if record_checkpoint["cp_index"] is checkpoint.index:
-                        split_time = relative_enter_time - record_checkpoint["time"]
-                        split_sign = "+" if split_time > 0 else "-"
-                        message_checkpoint_enter.send(
-                            player.index,
-                            index=checkpoint.index,
-                            time=ticks_to_timestamp(relative_enter_time),
-                            split_type="WR",
-                            split_sign=split_sign,
-                            split_time=ticks_to_timestamp(split_time),
-                        )
-                        return
+            wr_split = self.wr_split(class_string, checkpoint.index)
+            if wr_split is not None:
+                split_time = relative_enter_time - wr_split
+                split_sign = "+" if split_time > 0 else "-"
+                message_checkpoint_enter.send(
+                    player.index,
+                    index=checkpoint.index,
+                    time=ticks_to_timestamp(relative_enter_time),
+                    split_type="WR",
+                    split_sign=split_sign,
+                    split_time=ticks_to_timestamp(split_time),
+                )
+                return
 
             message_checkpoint_enter_no_split.send(
                 player.index,
@@ -314,36 +373,30 @@ class Map(Segment):
             )
 
 
-class MapTimeUploader(Thread):
-    """Class for uploading map on a separate thread with a callback."""
-
-    def __init__(self, map_id, player, callback=None):
-        """Create a new thread with callback."""
-        Thread.__init__(self)
-        self.map_id = map_id
-        self.player = player
-        self.callback = callback
-
-    def run(self):
-        """Run thread."""
-        player_class = None
-        if self.player.state.player_class == PlayerClass.SOLDIER:
-            player_class = 2
-        elif self.player.state.player_class == PlayerClass.DEMOMAN:
-            player_class = 4
-
-        checkpoints = []
-        for checkpoint in self.player.state.checkpoints:
-            checkpoints.append({"cp_index": checkpoint[0].index, "time": checkpoint[1]})
-
-        result = add_map_time(
-            self.map_id,
-            self.player.id_,
-            player_class,
-            self.player.state.map[1],
-            self.player.state.map[2],
-            checkpoints,
-        )
-
-        if self.callback is not None:
-            self.callback(result, self.player)
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _print_response(response):
+    """Print a failed api response."""
+    if response is None:
+        print("api unavailable")
+    elif response.status_code < 500:
+        print(f"api response: {response.status_code}\n{response.json()}")
+    else:
+        print(f"api response: {response.status_code}")
+
+
+def map_time_args(player):
+    """Return (player_class, start_time, end_time, checkpoints)
+    of a player's finished map run for add_map_time."""
+    player_class = None
+    if player.state.player_class == PlayerClass.SOLDIER:
+        player_class = 2
+    elif player.state.player_class == PlayerClass.DEMOMAN:
+        player_class = 4
+
+    checkpoints = []
+    for checkpoint in player.state.checkpoints:
+        checkpoints.append({"cp_index": checkpoint[0].index, "time": checkpoint[1]})
+
+    return player_class, player.state.map[1], player.state.map[2], checkpoints
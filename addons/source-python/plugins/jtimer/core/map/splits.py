@@ -0,0 +1,65 @@
+"""Module for checkpoint split tables."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from array import array
+import math
+
+
+# =============================================================================
+# >> SPLIT TABLE CLASS
+# =============================================================================
+class SplitTable:
+    """Checkpoint times of a run relative to its start,
+    indexed by checkpoint index."""
+
+    __slots__ = ("times",)
+
+    def __init__(self):
+        """Create a new empty SplitTable."""
+        # relative time at times[cp_index], nan if the run has no such checkpoint
+        self.times = array("d")
+
+    @staticmethod
+    def from_record(record):
+        """Create a SplitTable from a record returned by the api."""
+        table = SplitTable()
+        for checkpoint in record["checkpoints"]:
+            table.set(checkpoint["cp_index"], checkpoint["time"])
+        return table
+
+    @staticmethod
+    def from_run(checkpoints, start_time):
+        """Create a SplitTable from a State's [(Checkpoint, enter_time)],
+        e.g. for keeping a player's personal best splits."""
+        table = SplitTable()
+        for checkpoint, enter_time in checkpoints:
+            table.set(checkpoint.index, enter_time - start_time)
+        return table
+
+    def set(self, cp_index, time):
+        """Set relative time of a checkpoint."""
+        if cp_index >= len(self.times):
+            self.times.extend([math.nan] * (cp_index + 1 - len(self.times)))
+        self.times[cp_index] = time
+
+    def get(self, cp_index):
+        """Return relative time of a checkpoint or None."""
+        if 0 <= cp_index < len(self.times):
+            time = self.times[cp_index]
+            if not math.isnan(time):
+                return time
+        return None
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def build_split_tables(records):
+    """Return {class: SplitTable or None} for a map's records."""
+    return {
+        class_string: SplitTable.from_record(record) if record is not None else None
+        for class_string, record in records.items()
+    }
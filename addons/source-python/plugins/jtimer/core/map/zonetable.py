@@ -0,0 +1,126 @@
+"""Module for compiled per-map zone tables."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from collections import namedtuple
+from enum import IntEnum
+
+# Custom Imports
+from ..players.state import TimerMode
+from ..zones.zone import ZoneType
+
+
+# =============================================================================
+# >> ENUMS
+# =============================================================================
+class SegmentType(IntEnum):
+    """Enum for segment types."""
+
+    MAP = 0
+    COURSE = 1
+    BONUS = 2
+
+
+# =============================================================================
+# >> ZONE ENTRY
+# =============================================================================
+"""
+zone: Zone or Checkpoint
+segment: Segment the zone belongs to
+zone_type: ZoneType
+segment_type: SegmentType
+segment_index: position in Map.courses or Map.bonuses, 0 for the map
+modes: bitmask of TimerModes (1 << mode) checking this zone
+bit: bit of this zone in player zone masks
+"""
+ZoneEntry = namedtuple(
+    "ZoneEntry",
+    ["zone", "segment", "zone_type", "segment_type", "segment_index", "modes", "bit"],
+)
+
+
+# =============================================================================
+# >> ZONE TABLE CLASS
+# =============================================================================
+class ZoneTable:
+    """Flat table of all map, course and bonus zones.
+    Built once when zones are loaded, don't modify after."""
+
+    def __init__(self, map_):
+        """Compile zones of a map."""
+        entries = []
+
+        map_modes = 1 << TimerMode.MAP
+        course_modes = 1 << TimerMode.MAP | 1 << TimerMode.COURSE
+        bonus_modes = 1 << TimerMode.BONUS
+
+        segments = [(map_, SegmentType.MAP, 0, map_modes)]
+        for x, course in enumerate(map_.courses):
+            segments.append((course, SegmentType.COURSE, x, course_modes))
+        for x, bonus in enumerate(map_.bonuses):
+            segments.append((bonus, SegmentType.BONUS, x, bonus_modes))
+
+        for segment, segment_type, segment_index, modes in segments:
+            zones = [
+                (segment.start_zone, ZoneType.START),
+                (segment.end_zone, ZoneType.END),
+                *[(cp, ZoneType.CHECKPOINT) for cp in segment.checkpoints],
+            ]
+
+            for zone, zone_type in zones:
+                entries.append(
+                    ZoneEntry(
+                        zone,
+                        segment,
+                        zone_type,
+                        segment_type,
+                        segment_index,
+                        modes,
+                        1 << len(entries),
+                    )
+                )
+
+        self.entries = tuple(entries)
+        self.zones = tuple(entry.zone for entry in self.entries)
+        self.zone_bits = {entry.zone: entry.bit for entry in self.entries}
+
+        # {(timer_mode, course_index, bonus_index): bitmask}
+        self._active = {}
+
+    def active_mask(self, timer_mode, course_index, bonus_index):
+        """Return the bitmask of zones checked in a timer mode."""
+        key = (timer_mode, course_index, bonus_index)
+        mask = self._active.get(key)
+        if mask is None:
+            mask = self._active[key] = self._compile_mask(*key)
+        return mask
+
+    def _compile_mask(self, timer_mode, course_index, bonus_index):
+        """Compile the bitmask of zones checked in a timer mode."""
+        mode_bit = 1 << timer_mode
+        mask = 0
+        for entry in self.entries:
+            if not entry.modes & mode_bit:
+                continue
+            if timer_mode == TimerMode.COURSE and entry.segment_index != course_index:
+                continue
+            if timer_mode == TimerMode.BONUS and entry.segment_index != bonus_index:
+                continue
+            mask |= entry.bit
+        return mask
+
+    def overlap_mask(self, zones):
+        """Return the bitmask of a set of zones."""
+        mask = 0
+        for zone in zones:
+            mask |= self.zone_bits[zone]
+        return mask
+
+    def entries_in(self, mask):
+        """Yield entries of the set bits in a bitmask, in table order."""
+        while mask:
+            low = mask & -mask
+            yield self.entries[low.bit_length() - 1]
+            mask ^= low
@@ -21,6 +21,7 @@ from ..api.players import (
 )
 from ..chat.messages import message_player_join, message_player_join_unranked
 from ..config import API_CFG
+from ..helpers.completions import CompletionQueue
 
 # =============================================================================
 # >> GLOBAL VARIABLES
@@ -32,6 +33,20 @@ NULL_VECTOR = Vector(0.0, 0.0, 0.0)
 class Player:
     """Custom Player class for use with the timer."""
 
+    __slots__ = (
+        "id_",
+        "userid",
+        "steamid",
+        "index",
+        "name",
+        "state",
+        "has_start",
+        "gag",
+        "mute",
+        "command_restricted",
+        "hidechat",
+    )
+
     def __init__(self, id_, playerinfo, index):
         """Create a new player."""
         self.id_ = id_
@@ -104,7 +119,9 @@ class Player:
 
     @staticmethod
     def add_player(playerinfo, index):
-        """Add a player to the Timer."""
+        """Add a player to the Timer.
+        Blocking, the player is added on the main thread afterwards."""
+        userid = playerinfo.userid
         ip = address_from_playerinfo(playerinfo).split(":")[0]
         country, code = get_country(ip)
 
@@ -119,6 +136,17 @@ class Player:
                 steam_id=SteamID.parse(playerinfo.steamid).to_steamid2()
             )
 
+        CompletionQueue.instance().post(
+            Player._join, api_player, playerinfo, index, userid, country
+        )
+
+    @staticmethod
+    def _join(api_player, playerinfo, index, userid, country):
+        """Add a player to the Timer once their api info is in."""
+        if userid_to_source_player(userid) is None:
+            # left while we were waiting for the api
+            return
+
         player = None
         if api_player is not None:
             player = Player(api_player["id"], playerinfo, index)
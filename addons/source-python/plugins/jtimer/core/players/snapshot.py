@@ -0,0 +1,58 @@
+"""Module for reading player entity data once per tick."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Imports
+from entities.helpers import index_from_inthandle
+
+# Custom Imports
+from ..helpers.converts import userid_to_source_player
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+OBS_MODE_NONE = 0
+
+
+# =============================================================================
+# >> PLAYER SNAPSHOT CLASS
+# =============================================================================
+class PlayerSnapshot:
+    """Entity data of a player for a single tick."""
+
+    def __init__(self, source_player):
+        """Read entity data from a Source.Python player."""
+        self.index = source_player.index
+        self.origin = source_player.origin
+        self.maxs = source_player.maxs
+        self.velocity = source_player.velocity
+        self.observer_mode = source_player.get_property_int("m_iObserverMode")
+        self.observer_target = None
+
+        if self.observer_mode != OBS_MODE_NONE:
+            try:
+                self.observer_target = index_from_inthandle(
+                    source_player.get_property_int("m_hObserverTarget")
+                )
+            except (ValueError, OverflowError):
+                # not observing anyone
+                pass
+
+    def is_observer(self):
+        """Returns True if player is spectating."""
+        return self.observer_mode != OBS_MODE_NONE
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def take_snapshot(players):
+    """Read entity data of players.
+    Returns {index: PlayerSnapshot}, players without an entity are left out."""
+    snapshot = {}
+    for player in players:
+        source_player = userid_to_source_player(player.userid)
+        if source_player is not None:
+            snapshot[player.index] = PlayerSnapshot(source_player)
+    return snapshot
@@ -8,12 +8,16 @@ from enum import IntEnum
 
 # Source.Python Imports
 import mathlib
-from engines.server import server
-from players.entity import Player
-from players.helpers import index_from_userid
 
 # Custom Imports
-from ..hud import hud
+from ..zones.zone import ZoneType, max_tick_distance
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# max ticks between zone checks when far away from zones
+MAX_ZONE_CHECK_SKIP = 200
 
 
 # =============================================================================
@@ -22,27 +26,42 @@ from ..hud import hud
 class State:
     """Class for Player state."""
 
+    __slots__ = (
+        "player_reference",
+        "player_class",
+        "origin",
+        "center",
+        "extents",
+        "bounds",
+        "velocity",
+        "previous_origin",
+        "previous_center",
+        "previous_extents",
+        "previous_bounds",
+        "previous_velocity",
+        "timer_mode",
+        "map_state",
+        "course_state",
+        "bonus_state",
+        "courses",
+        "bonus",
+        "map",
+        "checkpoints",
+        "overlaps",
+        "zone_mask",
+        "zone_table",
+        "zone_check_ticks",
+        "zone_check_mode",
+        "bonus_index",
+        "course_index",
+    )
+
     def __init__(self, player):
         """Create a new State."""
         self.player_reference = player
-        self.player_class = PlayerClass.NONE
 
-        self.origin = mathlib.NULL_VECTOR
-        self.center = mathlib.NULL_VECTOR
-        self.extents = mathlib.NULL_VECTOR
+        # containers are only allocated here and cleared in place afterwards
         self.bounds = [mathlib.NULL_VECTOR, mathlib.NULL_VECTOR]
-        self.velocity = mathlib.NULL_VECTOR
-
-        self.previous_origin = self.origin
-        self.previous_center = self.center
-        self.previous_extents = self.extents
-        self.previous_bounds = self.bounds
-        self.previous_velocity = self.velocity
-
-        self.timer_mode = TimerMode.NONE
-        self.map_state = RunState.NONE
-        self.course_state = RunState.NONE
-        self.bonus_state = RunState.NONE
 
         # [[Segment, start_time, end_time]]
         self.courses = []
@@ -57,23 +76,47 @@ class State:
         # Overlapping zones
         self.overlaps = []
 
-        self.bonus_index = 0
-        self.course_index = 0
+        self.clear()
+
+    def clear(self):
+        """Reset everything, including timer mode and class."""
+        self.player_class = PlayerClass.NONE
+
+        self.timer_mode = TimerMode.NONE
+        self.map_state = RunState.NONE
+        self.course_state = RunState.NONE
+        self.bonus_state = RunState.NONE
+
+        # Bitmask of zones we were in on the last zone check,
+        # bits are from zone_table.
+        # Not cleared on reset, teleports and timer mode changes
+        # show up as enter/leave edges anyway.
+        self.zone_mask = 0
+        self.zone_table = None
+
+        # Ticks until the next zone check and the timer mode of the last one,
+        # zones can't be reached sooner when far away from them.
+        # Counted down instead of a server.tick, which restarts on map change.
+        self.zone_check_ticks = 0
+        self.zone_check_mode = TimerMode.NONE
+
+        self.reset()
 
     def reset(self):
         """Reset state."""
-        self.checkpoints = []
-        self.courses = []
-        self.bonus = [None, None, None]
-        self.map = [None, None, None]
+        self.checkpoints.clear()
+        self.courses.clear()
+        self.bonus[0] = self.bonus[1] = self.bonus[2] = None
+        self.map[0] = self.map[1] = self.map[2] = None
         self.bonus_index = 0
         self.course_index = 0
-        self.overlaps = []
+        self.overlaps.clear()
+        self.zone_check_ticks = 0
 
         self.origin = mathlib.NULL_VECTOR
         self.center = mathlib.NULL_VECTOR
         self.extents = mathlib.NULL_VECTOR
-        self.bounds = [mathlib.NULL_VECTOR, mathlib.NULL_VECTOR]
+        self.bounds[0] = self.bounds[1] = mathlib.NULL_VECTOR
         self.velocity = mathlib.NULL_VECTOR
 
         self.previous_origin = self.origin
@@ -88,81 +131,155 @@ class State:
             return True
         return False
 
-    def update(self, current_map, origin, vec_mins_maxs, velocity):
-        """Update player state."""
+    def update(self, current_map, snapshot):
+        """Update player state from this tick's PlayerSnapshot."""
 
         # are we running?
         if self.running:
-            if type(origin) != mathlib.Vector:
-                print(
-                    f"ERR: Trying to update Player State but origin is not Type(mathlib.Vector)!"
-                )
+            if not self.move(snapshot.origin, snapshot.maxs, snapshot.velocity):
                 return
 
-            if type(vec_mins_maxs) != mathlib.Vector:
-                print(
-                    f"ERR: Trying to update Player State but vec_mins_maxs is not Type(mathlib.Vector)!"
+            if current_map is not None and current_map.zone_triggers is not None:
+                # overlaps are tracked by trigger entities
+                overlapping = current_map.zone_triggers.overlapping(
+                    self.player_reference.index
                 )
-                return
+                self.check_zones(current_map, overlapping)
+
+            elif self.zone_check_due():
+                # only test zones near us
+                overlapping = set()
+                if self.active_zones(current_map):
+                    overlapping = current_map.zone_grid.overlapping(
+                        self.center, self.extents
+                    )
+
+                self.check_zones(current_map, overlapping)
+                self.schedule_zone_check(current_map)
+
+        self.update_observer(current_map, snapshot)
+
+    def move(self, origin, vec_mins_maxs, velocity):
+        """Update player position.
+        Returns True if zones should be checked this tick."""
+        if type(origin) != mathlib.Vector:
+            print(
+                f"ERR: Trying to update Player State but origin is not Type(mathlib.Vector)!"
+            )
+            return False
+
+        if type(vec_mins_maxs) != mathlib.Vector:
+            print(
+                f"ERR: Trying to update Player State but vec_mins_maxs is not Type(mathlib.Vector)!"
+            )
+            return False
+
+        # snapshot vectors are shared by everything reading this tick,
+        # copy them since they're changed in place below
+        origin = mathlib.Vector(*origin)
+        vec_mins_maxs = mathlib.Vector(*vec_mins_maxs)
+
+        self.previous_origin = self.origin
+        self.origin = origin
+
+        self.previous_extents = self.extents
+        self.extents = vec_mins_maxs
+        self.extents[2] /= 2
 
-            self.previous_origin = self.origin
-            self.origin = origin
+        self.previous_bounds = self.bounds
+        self.bounds[0] = origin + vec_mins_maxs
+        self.bounds[1] = origin - vec_mins_maxs
+        self.bounds[1][2] += vec_mins_maxs[2]
 
-            self.previous_extents = self.extents
-            self.extents = vec_mins_maxs
-            self.extents[2] /= 2
+        self.previous_center = self.center
+        self.center = self.origin
+        self.center[2] += vec_mins_maxs[2] / 2
 
-            self.previous_bounds = self.bounds
-            self.bounds[0] = origin + vec_mins_maxs
-            self.bounds[1] = origin - vec_mins_maxs
-            self.bounds[1][2] += vec_mins_maxs[2]
+        self.previous_velocity = self.velocity
+        self.velocity = velocity
 
-            self.previous_center = self.center
-            self.center = self.origin
-            self.center[2] += vec_mins_maxs[2] / 2
+        # first update
+        if self.previous_origin == mathlib.NULL_VECTOR:
+            return False
 
-            self.previous_velocity = self.velocity
-            self.velocity = velocity
+        return True
 
-            # first update
-            if self.previous_origin == mathlib.NULL_VECTOR:
-                return
+    def zone_check_due(self):
+        """Returns True if zones need to be checked this tick,
+        call once per tick."""
+        self.zone_check_ticks -= 1
+        if self.zone_check_ticks <= 0 or self.timer_mode != self.zone_check_mode:
+            return True
 
-            to_check = []
-            if self.timer_mode == TimerMode.MAP:
-                to_check.append(current_map)
-                to_check.extend(current_map.courses)
-            elif self.timer_mode == TimerMode.COURSE:
-                to_check.append(current_map.courses[self.course_index])
-            if self.timer_mode == TimerMode.BONUS:
-                to_check.append(current_map.bonuses[self.bonus_index])
-
-            for segment in to_check:
-                # check start_zone
-                if segment.start_zone.is_overlapping(self.center, self.extents):
-                    segment.on_enter_start(self.player_reference)
+        # moved further than possible in a tick, assume teleported
+        dx = self.origin[0] - self.previous_origin[0]
+        dy = self.origin[1] - self.previous_origin[1]
+        dz = self.origin[2] - self.previous_origin[2]
+        distance = max_tick_distance()
+        return dx * dx + dy * dy + dz * dz > distance * distance
+
+    def schedule_zone_check(self, current_map):
+        """Schedule the next zone check as late as possible
+        without missing a zone we could move into."""
+        self.zone_check_mode = self.timer_mode
+
+        if self.zone_mask or current_map is None:
+            self.zone_check_ticks = 1
+            return
+
+        clearance = current_map.zone_grid.clearance(self.center, self.extents)
+        ticks = min(clearance // max_tick_distance(), MAX_ZONE_CHECK_SKIP)
+        self.zone_check_ticks = max(1, int(ticks))
+
+    def active_zones(self, current_map):
+        """Return the bitmask of zones checked in our timer mode."""
+        if current_map is None:
+            return 0
+        return current_map.zone_table.active_mask(
+            self.timer_mode, self.course_index, self.bonus_index
+        )
+
+    def check_zones(self, current_map, overlapping):
+        """Call segment zone callbacks when entering or leaving zones.
+        overlapping is the set of zones we currently overlap."""
+        active = self.active_zones(current_map)
+        if not active:
+            self.zone_mask = 0
+            return
+
+        table = current_map.zone_table
+        previous = self.zone_mask if self.zone_table is table else 0
+        mask = table.overlap_mask(overlapping) & active
+
+        self.zone_mask = mask
+        self.zone_table = table
+
+        entered = mask & ~previous
+        left = previous & ~mask
+
+        for entry in table.entries_in(entered | left):
+            if entry.bit & entered:
+                if entry.zone_type == ZoneType.START:
+                    entry.segment.on_enter_start(self.player_reference)
+                elif entry.zone_type == ZoneType.END:
+                    entry.segment.on_enter_end(self.player_reference)
                 else:
-                    segment.on_leave_start(self.player_reference)
-
-                # check end zone
-                if segment.end_zone.is_overlapping(self.center, self.extents):
-                    segment.on_enter_end(self.player_reference)
+                    entry.segment.on_enter_checkpoint(
+                        self.player_reference, entry.zone
+                    )
 
-                # check checkpoints
-                for cp in segment.checkpoints:
-                    if cp.is_overlapping(self.center, self.extents):
-                        segment.on_enter_checkpoint(self.player_reference, cp)
+            elif entry.zone_type == ZoneType.START:
+                entry.segment.on_leave_start(self.player_reference)
 
+    def update_observer(self, current_map, snapshot):
+        """Stop timer when spectating."""
         # If player is spec, reset and blank timer/modes
-        if Player(index_from_userid(self.player_reference.userid)).is_observer():
+        if snapshot.is_observer():
             self.reset()
             self.timer_mode = TimerMode.NONE
             self.map_state = RunState.NONE
             self.course_state = RunState.NONE
             self.bonus_state = RunState.NONE
-        # update hud every half a second
-        if server.tick % 33 == 0:
-            hud.draw(self.player_reference, current_map)
 
 
 # =============================================================================
@@ -0,0 +1,120 @@
+"""Module for shedding non-critical work when ticks take too long."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+from collections import deque
+from enum import IntEnum
+import time
+
+# Custom Imports
+from .scheduler import Scheduler
+from ..config import TIMER_CFG
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# weight of the newest tick in the moving average
+AVERAGE_WEIGHT = 0.1
+
+# seconds between level changes
+LEVEL_HOLD = 1.0
+
+# fraction of the budget to drop under before recovering a level
+RECOVER_FRACTION = 0.5
+
+# hud interval multiplier from LoadLevel.SLOW_HUD on
+SLOW_HUD_SCALE = 2
+
+# calls waiting for load to drop, the oldest is dropped when full
+MAX_DEFERRED = 32
+
+
+# =============================================================================
+# >> LOAD CONTROLLER CLASS
+# =============================================================================
+class LoadController:
+    """Singleton LoadController class.
+    Tracks the time jtimer spends per tick and degrades hud, zone drawing
+    and menus in steps while over budget.
+    Zone checks and subtick timing are never degraded."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if LoadController.__instance is None:
+            LoadController()
+        return LoadController.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if LoadController.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        self.budget = TIMER_CFG["tick_budget"] / 1000
+        self.level = LoadLevel.NORMAL
+        # moving average of seconds spent per tick
+        self.average = 0.0
+        # time.monotonic() of the next allowed level change,
+        # server.tick restarts on map change
+        self.next_change = 0.0
+        # (function, args) waiting for load to drop
+        self.deferred = deque(maxlen=MAX_DEFERRED)
+        self.dropped = 0
+        LoadController.__instance = self
+
+    def update(self, seconds):
+        """Add the time spent this tick and change level if needed."""
+        self.average += (seconds - self.average) * AVERAGE_WEIGHT
+
+        if time.monotonic() >= self.next_change:
+            if self.average > self.budget and self.level < LoadLevel.DEFER_MENUS:
+                self._set_level(self.level + 1)
+            elif (
+                self.average < self.budget * RECOVER_FRACTION
+                and self.level > LoadLevel.NORMAL
+            ):
+                self._set_level(self.level - 1)
+
+        # run one deferred call per tick so recovering doesn't spike
+        if self.deferred and self.level < LoadLevel.DEFER_MENUS:
+            function, args = self.deferred.popleft()
+            function(*args)
+
+    def run_or_defer(self, function, *args):
+        """Call function now, or once load has dropped."""
+        if self.level >= LoadLevel.DEFER_MENUS:
+            if len(self.deferred) == MAX_DEFERRED:
+                self.dropped += 1
+            self.deferred.append((function, args))
+        else:
+            function(*args)
+
+    def _set_level(self, level):
+        """Apply a load level to scheduled jobs."""
+        self.level = LoadLevel(level)
+        self.next_change = time.monotonic() + LEVEL_HOLD
+
+        hud_job = Scheduler.instance().get("hud")
+        if hud_job is not None:
+            hud_job.scale = SLOW_HUD_SCALE if level >= LoadLevel.SLOW_HUD else 1
+
+        zones_job = Scheduler.instance().get("zones")
+        if zones_job is not None:
+            zones_job.paused = level >= LoadLevel.SKIP_ZONE_DRAW
+
+        print(f"[jtimer] Load level changed to {self.level.name}")
+
+
+# =============================================================================
+# >> ENUMS
+# =============================================================================
+class LoadLevel(IntEnum):
+    """Enum for load levels, each includes the ones before it."""
+
+    NORMAL = 0
+    SLOW_HUD = 1
+    SKIP_ZONE_DRAW = 2
+    DEFER_MENUS = 3
@@ -0,0 +1,125 @@
+"""Module for running periodic jobs spread over ticks."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+import time
+
+# Source.Python Imports
+from engines.server import server
+
+
+# =============================================================================
+# >> SCHEDULER CLASS
+# =============================================================================
+class Scheduler:
+    """Singleton Scheduler class.
+    Jobs are registered with an interval in seconds,
+    so they run at the same rate on any tickrate."""
+
+    __instance = None
+
+    def instance():
+        """Singleton instance"""
+        if Scheduler.__instance is None:
+            Scheduler()
+        return Scheduler.__instance
+
+    def __init__(self):
+        """Private constructor."""
+        if Scheduler.__instance is not None:
+            raise Exception("This class is a singleton, use .instance() access method.")
+
+        self.jobs = []
+        Scheduler.__instance = self
+
+    def get(self, name):
+        """Return job with name or None."""
+        for job in self.jobs:
+            if job.name == name:
+                return job
+        return None
+
+    def job(self, name, interval, items=None, key=None):
+        """Decorator for registering a periodic job.
+        Without items the function is called once every interval.
+        With items the function is called for every item returned by items(),
+        each item on its own tick so the work is spread over the interval.
+        key(item) returns an int that picks the item's tick."""
+
+        def decorator(function):
+            self.jobs.append(
+                _Job(name, interval, function, items, key, len(self.jobs))
+            )
+            return function
+
+        return decorator
+
+    def run(self):
+        """Run jobs due this tick."""
+        tick = server.tick
+        tick_interval = server.tick_interval
+
+        for job in self.jobs:
+            if job.paused:
+                continue
+
+            period = max(1, round(job.interval * job.scale / tick_interval))
+            phase = (tick + job.offset) % period
+
+            start = time.perf_counter()
+            if job.items is None:
+                if phase != 0:
+                    continue
+                job.function()
+            else:
+                ran = False
+                for item in job.items():
+                    if job.key(item) % period == phase:
+                        job.function(item)
+                        ran = True
+                # ticks where no item was due would dilute the average
+                if not ran:
+                    continue
+            job.record(time.perf_counter() - start)
+
+
+class _Job:
+    """Periodic job with timing statistics."""
+
+    __slots__ = (
+        "name",
+        "interval",
+        "function",
+        "items",
+        "key",
+        "offset",
+        "scale",
+        "paused",
+        "calls",
+        "seconds",
+        "max_seconds",
+    )
+
+    def __init__(self, name, interval, function, items, key, offset):
+        """Create a new job."""
+        self.name = name
+        self.interval = interval
+        self.function = function
+        self.items = items
+        self.key = key if key is not None else hash
+        # shifts jobs with the same interval onto different ticks
+        self.offset = offset
+        # interval multiplier and pause switch for shedding load
+        self.scale = 1
+        self.paused = False
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds):
+        """Add the duration of one run."""
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
@@ -3,10 +3,17 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python Imports
+import time
+from threading import Lock
+
 # Custom Imports
 from ..players.state import TimerMode
 from ..chat.messages import message_timer_enable, message_timer_disable
-from ..helpers.converts import steamid_to_player, userid_to_source_player
+from ..helpers.converts import steamid_to_player
+from ..players.snapshot import take_snapshot
+from ..helpers.utils import spectator_graph
+from ..config import TIMER_CFG
 
 
 # =============================================================================
@@ -16,7 +23,6 @@ class Timer:
     """Singleton Timer class"""
 
     __instance = None
-    players = []
     current_map = None
 
     def instance():
@@ -30,44 +36,119 @@ class Timer:
         if Timer.__instance is not None:
             raise Exception("This class is a singleton, use .instance() access method.")
 
-        self.players = []
         self.current_map = None
+        # players and lookups by steamid2, userid and index,
+        # replaced as a whole on changes so readers on other threads
+        # always see a consistent snapshot without locking
+        self._registry = _PlayerRegistry(())
+        self._registry_lock = Lock()
+        # {index: PlayerSnapshot} of entity data read this tick
+        self.snapshot = {}
+        # time spent in update_timers, for comparing zone backends
+        self.update_stats = {"ticks": 0, "seconds": 0.0}
         Timer.__instance = self
 
+    @property
+    def players(self):
+        """Snapshot of current players."""
+        return self._registry.players
+
+    def player_by_steamid(self, steamid):
+        """Return player with steamid2 or None."""
+        return self._registry.by_steamid.get(steamid)
+
+    def player_by_userid(self, userid):
+        """Return player with userid or None."""
+        return self._registry.by_userid.get(userid)
+
+    def player_by_index(self, index):
+        """Return player with entity index or None."""
+        return self._registry.by_index.get(index)
+
     def add_player(self, player):
         """Add player reference to timer,
 	    this will allow runs."""
-        for p in self.players:
-            if p.steamid == player.steamid:
+        with self._registry_lock:
+            if player.steamid in self._registry.by_steamid:
                 return
-        self.players.append(player)
+            self._registry = _PlayerRegistry(self._registry.players + (player,))
 
     def remove_player(self, steamid):
         """Remove player reference from timer,
 	    this will prevent runs."""
-        for x in range(0, len(self.players)):
-            if self.players[x].steamid == steamid:
-                self.players.pop(x)
+        with self._registry_lock:
+            if steamid not in self._registry.by_steamid:
                 return
+            self._registry = _PlayerRegistry(
+                tuple(p for p in self._registry.players if p.steamid != steamid)
+            )
 
     def clear(self):
         """Reset everything on map load."""
-        self.players = []
+        with self._registry_lock:
+            self._registry = _PlayerRegistry(())
         self.current_map = None
 
     def update_timers(self):
         """Update all timers of active players."""
+        start = time.perf_counter()
+
+        self.snapshot = take_snapshot(self.players)
+        spectator_graph.update(self.snapshot, self._registry.by_index)
+
+        if (
+            TIMER_CFG["batch_zones"]
+            and self.current_map is not None
+            and self.current_map.zone_arrays is not None
+            and self.current_map.zone_triggers is None
+        ):
+            self._update_timers_batched()
+        else:
+            self._update_timers()
+
+        self.update_stats["ticks"] += 1
+        self.update_stats["seconds"] += time.perf_counter() - start
+
+    def _update_timers(self):
+        """Update all timers of active players one at a time."""
         for p in self.players:
-            source_player = userid_to_source_player(p.userid)
-            if source_player is None:
-                self.players.remove(p)
+            snapshot = self.snapshot.get(p.index)
+            if snapshot is None:
+                self.remove_player(p.steamid)
                 continue
-            p.state.update(
-                self.current_map,
-                source_player.origin,
-                source_player.maxs,
-                source_player.velocity,
-            )
+            p.state.update(self.current_map, snapshot)
+
+    def _update_timers_batched(self):
+        """Update all timers of active players,
+        testing zone overlaps of all players in one pass."""
+        moved = []
+        for p in self.players:
+            snapshot = self.snapshot.get(p.index)
+            if snapshot is None:
+                self.remove_player(p.steamid)
+                continue
+            if not (
+                p.state.running
+                and p.state.move(snapshot.origin, snapshot.maxs, snapshot.velocity)
+            ):
+                continue
+
+            if p.state.zone_check_due():
+                moved.append((p, snapshot, p.state.active_zones(self.current_map)))
+            else:
+                moved.append((p, snapshot, None))
+
+        overlaps = self.current_map.zone_arrays.overlaps(
+            [p.state for p, snapshot, active in moved if active]
+        )
+        overlaps.reverse()
+
+        for p, snapshot, active in moved:
+            if active is not None:
+                overlapping = overlaps.pop() if active else set()
+                p.state.check_zones(self.current_map, overlapping)
+                p.state.schedule_zone_check(self.current_map)
+            p.state.update_observer(self.current_map, snapshot)
 
     def toggle_timer(self, player):
         """Toggle player timer on and off."""
@@ -81,3 +162,14 @@ class Timer:
             message_timer_enable.send(player.index)
             player.teleport_to_start()
             return
+
+
+class _PlayerRegistry:
+    """Immutable snapshot of players with lookups."""
+
+    def __init__(self, players):
+        """Create a new snapshot from a tuple of players."""
+        self.players = players
+        self.by_steamid = {p.steamid: p for p in players}
+        self.by_userid = {p.userid: p for p in players}
+        self.by_index = {p.index: p for p in players}
@@ -0,0 +1,58 @@
+"""Module for testing zone overlaps of all players at once.
+Requires numpy, ZoneArrays is None if numpy is not installed."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# =============================================================================
+# >> ZONE ARRAYS CLASS
+# =============================================================================
+class _ZoneArrays:
+    """Struct-of-arrays table of zone centers and half-widths."""
+
+    def __init__(self, zones):
+        """Create a new ZoneArrays from a list of zones."""
+        self.zones = list(zones)
+        self.centers = numpy.array(
+            [[zone.center[i] for i in range(3)] for zone in self.zones],
+            dtype=numpy.float64,
+        ).reshape(-1, 3)
+        self.extents = numpy.array(
+            [[zone.extents[i] for i in range(3)] for zone in self.zones],
+            dtype=numpy.float64,
+        ).reshape(-1, 3)
+
+    def overlaps(self, states):
+        """Return the set of overlapping zones for each player state.
+        Same AABB-AABB test as Zone.is_overlapping, for all pairs at once."""
+        if not states:
+            return []
+
+        centers = numpy.array(
+            [[state.center[i] for i in range(3)] for state in states],
+            dtype=numpy.float64,
+        )
+        extents = numpy.array(
+            [[state.extents[i] for i in range(3)] for state in states],
+            dtype=numpy.float64,
+        )
+
+        # (players, zones, axes)
+        distance = numpy.abs(centers[:, None, :] - self.centers[None, :, :])
+        reach = extents[:, None, :] + self.extents[None, :, :]
+        matrix = (distance <= reach).all(axis=2)
+
+        result = []
+        for row in matrix:
+            result.append({self.zones[x] for x in numpy.flatnonzero(row)})
+        return result
+
+
+ZoneArrays = _ZoneArrays if numpy is not None else None
@@ -0,0 +1,92 @@
+"""Module for spatial indexing of zones."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python Imports
+import math
+
+
+# =============================================================================
+# >> ZONE GRID CLASS
+# =============================================================================
+class ZoneGrid:
+    """Uniform grid on the xy-plane for finding zones near a position.
+    Zones are bucketed into every cell their bounds touch,
+    so a lookup only has to test the zones in the cells under the player."""
+
+    def __init__(self, cell_size=512):
+        """Create a new empty ZoneGrid."""
+        self.cell_size = cell_size
+        self.zones = []
+        self.cells = {}
+        # {cell: xy distance from cell to the nearest zone}, filled lazily
+        self.clearances = {}
+
+    def add(self, zone):
+        """Add a zone to the grid."""
+        ordinal = len(self.zones)
+        self.zones.append(zone)
+
+        for cell in self._cells_in(zone.bounds[0], zone.bounds[1]):
+            self.cells.setdefault(cell, []).append(ordinal)
+
+        self.clearances.clear()
+
+    def query(self, center, extents):
+        """Return zones in the cells touched by an AABB, in insertion order."""
+        mins = (center[0] - extents[0], center[1] - extents[1])
+        maxs = (center[0] + extents[0], center[1] + extents[1])
+
+        ordinals = set()
+        for cell in self._cells_in(mins, maxs):
+            ordinals.update(self.cells.get(cell, ()))
+
+        return [self.zones[x] for x in sorted(ordinals)]
+
+    def overlapping(self, center, extents):
+        """Return the set of zones overlapping an AABB."""
+        return {
+            zone
+            for zone in self.query(center, extents)
+            if zone.contains_expanded(center, extents)
+        }
+
+    def clearance(self, center, extents):
+        """Return a lower bound for the xy distance between an AABB
+        and the nearest zone."""
+        mins = (center[0] - extents[0], center[1] - extents[1])
+        maxs = (center[0] + extents[0], center[1] + extents[1])
+
+        result = math.inf
+        for cell in self._cells_in(mins, maxs):
+            distance = self.clearances.get(cell)
+            if distance is None:
+                distance = self.clearances[cell] = self._cell_clearance(cell)
+            result = min(result, distance)
+        return result
+
+    def _cell_clearance(self, cell):
+        """Distance from a cell to the nearest zone."""
+        x0 = cell[0] * self.cell_size
+        y0 = cell[1] * self.cell_size
+        x1 = x0 + self.cell_size
+        y1 = y0 + self.cell_size
+
+        result = math.inf
+        for zone in self.zones:
+            dx = max(zone.bounds[0][0] - x1, x0 - zone.bounds[1][0], 0)
+            dy = max(zone.bounds[0][1] - y1, y0 - zone.bounds[1][1], 0)
+            result = min(result, math.sqrt(dx * dx + dy * dy))
+        return result
+
+    def _cells_in(self, mins, maxs):
+        """Yield all cells between two xy corners."""
+        x0 = math.floor(mins[0] / self.cell_size)
+        y0 = math.floor(mins[1] / self.cell_size)
+        x1 = math.floor(maxs[0] / self.cell_size)
+        y1 = math.floor(maxs[1] / self.cell_size)
+
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield (x, y)
@@ -0,0 +1,89 @@
+"""Module for detecting zone overlaps with trigger entities.
+Lets the engine do the overlap tests instead of polling zones every tick."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Imports
+from engines.precache import Model
+from entities.constants import SolidType, EntityEffects
+from entities.entity import Entity
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# triggers need a model to spawn, bounds are set afterwards
+trigger_model = Model("models/error.mdl")
+
+# trigger_multiple spawnflag for being touched by clients
+SF_TRIGGER_ALLOW_CLIENTS = 1
+
+
+# =============================================================================
+# >> ZONE TRIGGERS CLASS
+# =============================================================================
+class ZoneTriggers:
+    """Trigger entities for all zones of a map."""
+
+    def __init__(self, zones):
+        """Spawn a trigger for each zone that isn't empty."""
+        # {trigger index: Zone}
+        self.zones = {}
+        # {player index: set of touched zones}
+        self.touching = {}
+
+        for zone in zones:
+            # unset zones would leave a stray trigger at the world origin
+            if zone.is_empty():
+                continue
+            trigger = self._spawn_trigger(zone)
+            self.zones[trigger.index] = zone
+
+    def overlapping(self, player_index):
+        """Return the set of zones the player is touching."""
+        return self.touching.get(player_index, set())
+
+    def on_output(self, output_name, activator, caller):
+        """Track StartTouch and EndTouch outputs of our triggers."""
+        if caller is None or activator is None:
+            return
+
+        zone = self.zones.get(caller.index)
+        if zone is None:
+            return
+
+        if output_name == "OnStartTouch":
+            self.touching.setdefault(activator.index, set()).add(zone)
+        elif output_name == "OnEndTouch":
+            self.touching.get(activator.index, set()).discard(zone)
+
+    def remove_player(self, player_index):
+        """Forget touches of a player."""
+        self.touching.pop(player_index, None)
+
+    def remove(self):
+        """Remove all trigger entities."""
+        for index in self.zones.keys():
+            try:
+                Entity(index).remove()
+            except ValueError:
+                # already removed by a level change
+                pass
+        self.zones = {}
+        self.touching = {}
+
+    @staticmethod
+    def _spawn_trigger(zone):
+        """Spawn an invisible trigger_multiple covering the zone."""
+        trigger = Entity.create("trigger_multiple")
+        trigger.set_key_value_int("spawnflags", SF_TRIGGER_ALLOW_CLIENTS)
+        trigger.spawn()
+
+        trigger.model = trigger_model
+        trigger.origin = zone.center
+        trigger.mins = zone.extents * -1
+        trigger.maxs = zone.extents
+        trigger.solid_type = SolidType.BBOX
+        trigger.effects |= EntityEffects.NODRAW
+        trigger.call_input("Enable")
+        return trigger
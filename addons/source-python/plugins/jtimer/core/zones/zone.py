@@ -3,8 +3,13 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python Imports
+from enum import IntEnum
+import math
+
 # Source.Python Imports
 from engines.server import server
+from cvars import ConVar
 from engines.precache import Model
 from mathlib import Vector, NULL_VECTOR
 from effects import box
@@ -15,6 +20,20 @@ from filters.recipients import RecipientFilter
 # =============================================================================
 model = Model("sprites/laser.vmt")
 
+INF = float("inf")
+
+# sv_maxvelocity clamps every axis separately
+sv_maxvelocity = ConVar("sv_maxvelocity")
+
+# extra distance allowed on top of max velocity, e.g. for rounding
+TICK_DISTANCE_MARGIN = 1.1
+
+# max hull sizes to keep expanded bounds for per zone
+EXPANDED_CACHE_SIZE = 16
+
+# hit/miss counts for expanded bounds lookups
+expanded_cache_stats = {"hits": 0, "misses": 0}
+
 
 # =============================================================================
 # >> ZONE CLASS
@@ -22,6 +41,16 @@ model = Model("sprites/laser.vmt")
 class Zone:
     """Class for Segment Zones."""
 
+    __slots__ = (
+        "center",
+        "extents",
+        "bounds",
+        "orientation",
+        "_corner",
+        "_direction",
+        "_expanded",
+    )
+
     def __init__(self, p1=NULL_VECTOR, p2=NULL_VECTOR, orientation=0):
         """Create a new Zone."""
         self.center = (p1 + p2) / 2
@@ -31,6 +60,16 @@ class Zone:
         self.bounds = (self.center - self.extents, self.center + self.extents)
         # (z) rotation of the dz, used for starting zones
         self.orientation = orientation
+        # preallocated buffers for time_to_zone_edge,
+        # Vector components are floats so values round the same as before
+        self._corner = Vector(0.0, 0.0, 0.0)
+        self._direction = Vector(0.0, 0.0, 0.0)
+        # {(x, y, z) hull half-widths: bounds grown by the hull}
+        self._expanded = {}
+
+    def is_empty(self):
+        """Returns True if the zone has no volume, like a default Zone()."""
+        return not (self.extents[0] and self.extents[1] and self.extents[2])
 
     def is_overlapping(self, other_center, other_extents):
         """AABB-AABB test. Returns True on overlap."""
@@ -48,13 +87,39 @@ class Zone:
 
         return x and y and z
 
+    def contains_expanded(self, other_center, other_extents):
+        """Point-in-box test of other_center against our bounds
+        grown by other_extents. Same as is_overlapping,
+        but the grown bounds are cached per hull size."""
+        key = (other_extents[0], other_extents[1], other_extents[2])
+        expanded = self._expanded.get(key)
+
+        if expanded is None:
+            expanded_cache_stats["misses"] += 1
+            if len(self._expanded) >= EXPANDED_CACHE_SIZE:
+                self._expanded.clear()
+            expanded = self._expanded[key] = tuple(
+                self.center[i] + sign * (self.extents[i] + key[i])
+                for i in range(0, 3)
+                for sign in (-1, 1)
+            )
+        else:
+            expanded_cache_stats["hits"] += 1
+
+        return (
+            expanded[0] <= other_center[0] <= expanded[1]
+            and expanded[2] <= other_center[1] <= expanded[3]
+            and expanded[4] <= other_center[2] <= expanded[5]
+        )
+
+    def clear_expanded(self):
+        """Forget cached grown bounds, call when bounds change."""
+        self._expanded.clear()
+
     def time_to_zone_edge(self, other_center, other_extents, velocity, position_delta):
         """Floating point time until player bounding box will leave the zone-"""
 
-        # max distance travelled in a tick ( sqrt(sqrt(3500^2 + 3500^2) + 3500^2) )
-        dist = 91
-
-        if position_delta > dist:
+        if position_delta > max_tick_distance():
             # player moved more than max velocity, assume teleported
             return 1.0
 
@@ -64,34 +129,34 @@ class Zone:
         corner = self.closest_corner(other_center, other_extents)
 
         # get normalized direction of player velocity
-        direction = Vector.normalized(velocity)
+        direction = self._direction
+        direction[0] = velocity[0]
+        direction[1] = velocity[1]
+        direction[2] = velocity[2]
+        direction.normalize()
 
-        # for some reason using mathlib.NULL_VECTOR here for dirfrac
-        # causes corner vector to get all messed up,
-        # i guess mathlib.NULL_VECTOR somehow refers to the same instance
+        # slab test per axis, kept as scalars to avoid allocating lists
+        d = direction[0]
+        dirfrac = INF if d == 0.0 else 1.0 / d
+        # t1, t2
+        t1 = (self.bounds[0][0] - corner[0]) * dirfrac
+        t2 = (self.bounds[1][0] - corner[0]) * dirfrac
 
-        dirfrac = [0.0, 0.0, 0.0]
-        for i in range(0, 3):
-            if direction[i] == 0.0:
-                dirfrac[i] = float("inf")
-            else:
-                dirfrac[i] = 1.0 / direction[i]
-
-        # t1, t3, t5
-        vt0 = [0.0, 0.0, 0.0]
-        for i in range(0, 3):
-            vt0[i] = (self.bounds[0][i] - corner[i]) * dirfrac[i]
+        d = direction[1]
+        dirfrac = INF if d == 0.0 else 1.0 / d
+        # t3, t4
+        t3 = (self.bounds[0][1] - corner[1]) * dirfrac
+        t4 = (self.bounds[1][1] - corner[1]) * dirfrac
 
-        # t2, t4, t6
-        vt1 = [0.0, 0.0, 0.0]
-        for i in range(0, 3):
-            vt1[i] = (self.bounds[1][i] - corner[i]) * dirfrac[i]
+        d = direction[2]
+        dirfrac = INF if d == 0.0 else 1.0 / d
+        # t5, t6
+        t5 = (self.bounds[0][2] - corner[2]) * dirfrac
+        t6 = (self.bounds[1][2] - corner[2]) * dirfrac
 
         # tmin is negative if we're leaving a zone, use abs
-        tmin = abs(
-            max(max(min(vt0[0], vt1[0]), min(vt0[1], vt1[1])), min(vt0[2], vt1[2]))
-        )
-        tmax = min(min(max(vt0[0], vt1[0]), max(vt0[1], vt1[1])), max(vt0[2], vt1[2]))
+        tmin = abs(max(max(min(t1, t2), min(t3, t4)), min(t5, t6)))
+        tmax = min(min(max(t1, t2), max(t3, t4)), max(t5, t6))
 
         # if tmax < 0, the whole AABB is behind us,
         # meaning we've already entered/left the zone.
@@ -117,8 +182,9 @@ class Zone:
         return max(0, min(time, 1))
 
     def closest_corner(self, other_center, other_extents):
-        """get closest corner of other box to ours"""
-        corner = NULL_VECTOR
+        """get closest corner of other box to ours.
+        Returns a buffer owned by the zone, copy it if you need to keep it."""
+        corner = self._corner
 
         for i in range(0, 3):
             if self.center[i] < other_center[i]:
@@ -148,6 +214,7 @@ class Zone:
         self.bounds[end][axis] += direction * units
         self.center = self.bounds[0] + self.bounds[1] / 2
         self.extents = self.bounds[1] - self.center
+        self.clear_expanded()
 
     def draw(self):
         """Draw this zone to all players."""
@@ -170,3 +237,28 @@ class Zone:
             model=model,
             start_frame=0,
         )
+
+
+# =============================================================================
+# >> ENUMS
+# =============================================================================
+class ZoneType(IntEnum):
+    """Enum for zone types."""
+
+    START = 0
+    END = 1
+    CHECKPOINT = 2
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def max_tick_distance():
+    """Max distance a player can travel in a tick at the current tickrate,
+    about 91 units plus margin at 66 tick with the default sv_maxvelocity."""
+    return (
+        sv_maxvelocity.get_float()
+        * math.sqrt(3)
+        * server.tick_interval
+        * TICK_DISTANCE_MARGIN
+    )
@@ -8,28 +8,36 @@ from commands.typed import TypedSayCommand
 from commands import CommandReturn
 from players.helpers import playerinfo_from_index
 from steam import SteamID
+from engines.server import server
 
 # Custom imports
 from .core.timer.timer import Timer
 from .core.helpers.converts import steamid_to_player
 from .core.helpers.utils import is_player
-from .core.map.map import Map
+from .core.map.loader import MapLoader
 from .core.api.auth import on_load as auth_on_load, on_unload as auth_on_unload
 from .core.hooks import *
 from .core.commands.commands import register_commands
+from .core.commands.servercommands import *
+from .core.helpers.executor import Executor
+from .core.api.journal import UploadJournal
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
 def load():
     """Called when Source.Python loads the plugin."""
-    Map.get_map()
     auth_on_load()
+    MapLoader.instance().load(server.map_name)
+    UploadJournal.instance().start()
     register_commands()
     print(f"[jtimer] Loaded!")
 
 
 def unload():
     """Called when Source.Python unloads the plugin."""
+    MapLoader.instance().cancel()
+    UploadJournal.instance().close()
     auth_on_unload()
+    Executor.instance().shutdown()
     print(f"[jtimer] Unloaded!")